@@ -1,34 +1,1156 @@
+import codecs
+import difflib
+import hashlib
+import json
+import marshal
+import mmap
+import multiprocessing
 import os
+import re
+import shutil
+import signal
+import struct
 import subprocess
+import stat
 import sys
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import (
+    FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+)
+from itertools import accumulate, chain, islice
 from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QFileDialog, QToolBar,
     QMessageBox, QWidget, QPlainTextEdit, QVBoxLayout, QTextEdit,
     QMenuBar, QInputDialog, QStatusBar, QSplitter, QHBoxLayout,
     QLabel, QPushButton, QTabWidget, QDialog, QDialogButtonBox,
-    QCheckBox, QSpinBox, QFormLayout, QComboBox, QTreeView, QFileSystemModel,QMenu,QLineEdit
+    QCheckBox, QSpinBox, QFormLayout, QComboBox, QTreeView, QFileSystemModel,QMenu,QLineEdit,QScrollBar,QProgressBar,
+    QDockWidget, QTreeWidget, QTreeWidgetItem, QToolTip
 )
 from PySide6.QtGui import (
     QColor, QPainter, QFont, QSyntaxHighlighter, QTextCharFormat,
     QAction, QKeySequence, QShortcut, QPixmap, QIcon,QTextDocument,QTextCursor
 )
-from PySide6.QtCore import Qt, QRect, QRegularExpression, QThread, Signal, QTimer, QSettings,QDir,QSize
+from PySide6.QtCore import Qt, QEvent, QPoint, QRect, QThread, Signal, QTimer, QSettings,QDir,QSize,QObject,QRunnable,QThreadPool,QStandardPaths,QEventLoop,QFileSystemWatcher
+
+
+# ---------- Build Jobs ----------
+# Build requests arriving within this window of each other merge into one
+BUILD_DEBOUNCE_MS = 250
+
+
+def kill_process_group(process):
+    # The shell and everything it started: the compiler driver, cc1plus, as, ld
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+class BuildProcesses:
+    # The processes of one build, each started in a process group of its own
+    # so cancelling the build kills them with all their children
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = set()
+        self.cancelled = False
+
+    def popen(self, command, **kwargs):
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        with self.lock:
+            if self.cancelled:
+                raise OSError("Build cancelled")
+            process = subprocess.Popen(command, **kwargs)
+            self.running.add(process)
+        return process
+
+    def wait(self, process):
+        try:
+            return process.wait()
+        finally:
+            with self.lock:
+                self.running.discard(process)
+
+    def run(self, command, capture_output=False, input=None, **kwargs):
+        # Like subprocess.run; once the build is cancelled, return code -1 and no output
+        if capture_output:
+            kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+        if input is not None:
+            kwargs["stdin"] = subprocess.PIPE
+        try:
+            process = self.popen(command, **kwargs)
+        except OSError:
+            empty = "" if kwargs.get("text") else b""
+            return subprocess.CompletedProcess(command, -1, empty, empty)
+        try:
+            stdout, stderr = process.communicate(input)
+        finally:
+            self.wait(process)
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            for process in self.running:
+                kill_process_group(process)
+
+
+class BuildJobs(QObject):
+    # Runs at most one build per output path. A request waits BUILD_DEBOUNCE_MS
+    # for newer ones (the latest wins), cancels whatever build still writes
+    # that path, and starts once it has stopped.
+    job_cancelled = Signal(str)  # output path
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = {}  # output path -> callable starting the build thread and returning it
+        self.running = {}
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(BUILD_DEBOUNCE_MS)
+        self.timer.timeout.connect(self.start_pending)
+
+    def submit(self, output_path, start):
+        self.pending[output_path] = start
+        self.timer.start()
+
+    def start_pending(self):
+        for output_path in list(self.pending):
+            job = self.running.get(output_path)
+            if job is not None:
+                # Started again from on_finished once this one has stopped
+                if job.isRunning() and not job.isInterruptionRequested():
+                    self.cancel(job)
+                    self.job_cancelled.emit(output_path)
+                continue
+            job = self.pending.pop(output_path)()
+            self.running[output_path] = job
+            job.finished.connect(lambda output_path=output_path, job=job: self.on_finished(output_path, job))
+
+    def on_finished(self, output_path, job):
+        if self.running.get(output_path) is job:
+            del self.running[output_path]
+        if output_path in self.pending and not self.timer.isActive():
+            self.start_pending()
+
+    def cancel(self, job):
+        # A superseded build reports nothing
+        job.compilation_finished.disconnect()
+        job.cancel()
+
+    def shutdown(self):
+        self.timer.stop()
+        self.pending.clear()
+        for job in self.running.values():
+            # Superseded jobs were cancelled, and disconnected, already
+            if job.isRunning() and not job.isInterruptionRequested():
+                self.cancel(job)
+        for job in self.running.values():
+            job.wait()
 
 
 # ---------- Compilation Thread ----------
+# Compiler output is forwarded to the log in batches at most this often
+COMPILE_OUTPUT_INTERVAL = 0.1
+# Lines forwarded per build; the rest are only counted
+COMPILE_OUTPUT_MAX_LINES = 5000
+COMPILE_OUTPUT_MAX_LINE_CHARS = 2000
+# Lines of stderr shown in the error message box
+COMPILE_ERROR_PREVIEW_LINES = 20
+
+
 class CompilationThread(QThread):
-    compilation_finished = Signal(int, str, str)  # return_code, stdout, stderr
+    output_received = Signal(list)  # lines from stdout and stderr
+    compilation_finished = Signal(int, str, float)  # return_code, first stderr lines, seconds
     
-    def __init__(self, compile_cmd, run_cmd=None):
+    def __init__(self, compile_cmd, output_path=None, cache=None, build_args=None, headers=None):
         super().__init__()
         self.compile_cmd = compile_cmd
-        self.run_cmd = run_cmd
+        self.output_path = output_path
+        self.cache = cache
+        self.headers = headers
+        self.build_args = build_args  # (compiler, flags, source), for the cache key and precompiled header
+        self.processes = BuildProcesses()
+        self.lock = threading.Lock()
+        self.pending = []
+        self.output = []
+        self.errors = []
+        self.forwarded = 0
+        self.dropped = 0
     
     def run(self):
-        # Compile
-        result = subprocess.run(self.compile_cmd, shell=True, capture_output=True, text=True)
-        self.compilation_finished.emit(result.returncode, result.stdout, result.stderr)
+        # Compile, reading both pipes line by line as the compiler writes them
+        started = time.perf_counter()
+        key = None
+        compile_cmd = self.compile_cmd
+        if self.build_args:
+            compiler, flags, source = self.build_args
+        if self.cache:
+            key = self.cache.key(compiler, flags, source, "program", run=self.processes.run)
+            output = self.cache.fetch(key, self.output_path) if key else None
+            if output is not None:
+                self.output_received.emit(output.splitlines()
+                                          + [f"🗃️ Restored from the build cache ({self.cache.stats()})"])
+                self.compilation_finished.emit(0, "", time.perf_counter() - started)
+                return
+        if self.headers and not self.isInterruptionRequested():
+            try:
+                with open(source, encoding="utf-8", errors="replace") as f:
+                    includes = leading_system_includes(f.read(PCH_SCAN_CHARS))
+            except OSError:
+                includes = []
+            if includes:
+                prefix, lines = self.headers.prepare(compiler, flags, includes, self.processes.run)
+                self.output_received.emit(lines)
+                if prefix:
+                    compile_cmd = f'{compile_cmd} -include "{prefix}"'
+        try:
+            process = self.processes.popen(compile_cmd, shell=True, stdout=subprocess.PIPE,
+                                           stderr=subprocess.PIPE, text=True, errors="replace")
+        except OSError as e:
+            self.compilation_finished.emit(-1, str(e), time.perf_counter() - started)
+            return
+        readers = [threading.Thread(target=self.read_lines, args=(process.stdout, False), daemon=True),
+                   threading.Thread(target=self.read_lines, args=(process.stderr, True), daemon=True)]
+        for reader in readers:
+            reader.start()
+        while True:
+            alive = [reader for reader in readers if reader.is_alive()]
+            if not alive:
+                break
+            alive[0].join(COMPILE_OUTPUT_INTERVAL)
+            self.flush()
+        return_code = self.processes.wait(process)
+        self.flush()
+        if self.dropped:
+            self.output_received.emit([f"... {self.dropped} more line(s) not shown"])
+        if key and return_code == 0:
+            self.cache.store(key, self.output_path, "\n".join(self.output))
+            self.output_received.emit([f"🗃️ Stored in the build cache ({self.cache.stats()})"])
+        self.compilation_finished.emit(return_code, "".join(self.errors), time.perf_counter() - started)
+
+    def cancel(self):
+        # Kills the compiler with everything it started
+        self.requestInterruption()
+        self.processes.cancel()
+
+    def read_lines(self, stream, is_error):
+        for line in stream:
+            with self.lock:
+                if is_error and len(self.errors) < COMPILE_ERROR_PREVIEW_LINES:
+                    self.errors.append(line)
+                if self.forwarded < COMPILE_OUTPUT_MAX_LINES:
+                    line = line.rstrip("\n")[:COMPILE_OUTPUT_MAX_LINE_CHARS]
+                    self.pending.append(line)
+                    self.output.append(line)
+                    self.forwarded += 1
+                else:
+                    self.dropped += 1
+        stream.close()
+
+    def flush(self):
+        with self.lock:
+            lines, self.pending = self.pending, []
+        if lines:
+            self.output_received.emit(lines)
+
+
+# ---------- Build Cache ----------
+# Programs and objects are stored under a hash of everything that decides
+# their contents: the compiler's identity, the flags and the preprocessed
+# source. An entry is the <key> artifact plus <key>.log, the compiler output
+# replayed on a hit; the artifact's mtime records its last use.
+BUILD_CACHE_LOG_SUFFIX = ".log"
+
+
+def build_cache_dir():
+    path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), "build_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# Compiler identities are looked up once per executable (path, size, mtime)
+_compiler_identities = {}
+
+
+def compiler_identity(compiler, run=subprocess.run):
+    # --version plus the executable's size and mtime, so an upgrade in place changes it;
+    # run is the launcher of the build asking, so cancelling the build stops it too
+    executable = shutil.which(compiler) or compiler
+    try:
+        info = os.stat(executable)
+        stamp = (executable, info.st_size, info.st_mtime_ns)
+    except OSError:
+        stamp = (executable, 0, 0)
+    identity = _compiler_identities.get(stamp)
+    if identity is None:
+        result = run(f"{compiler} --version", shell=True, capture_output=True)
+        identity = repr(stamp).encode("utf-8") + result.stdout + result.stderr
+        if result.returncode >= 0:
+            # A cancelled or killed run said nothing about the compiler
+            identity = _compiler_identities.setdefault(stamp, identity)
+    return identity
+
+
+class BuildCache:
+    # Shared by every build of the session; safe to use from several threads
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes  # 0 turns the cache off
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, compiler, flags, source, kind, extra_args="", run=subprocess.run):
+        # None when the cache is off or the source does not preprocess (the
+        # compiler then reports why); extra_args are passed but not hashed
+        if self.max_bytes <= 0:
+            return None
+        try:
+            result = run(f'{compiler} -E "{source}" {extra_args} {flags}', shell=True, capture_output=True)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        digest = hashlib.sha256()
+        for part in (compiler_identity(compiler, run), flags.encode("utf-8"), kind.encode("utf-8"), result.stdout):
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def fetch(self, key, output_path):
+        # Restores the artifact to output_path and returns its compiler output, or None on a miss
+        artifact = os.path.join(self.cache_dir, key)
+        try:
+            with open(artifact + BUILD_CACHE_LOG_SUFFIX, encoding="utf-8", errors="replace") as f:
+                output = f.read()
+            self.copy(artifact, output_path)
+            os.utime(artifact)
+        except OSError:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return output
+
+    def store(self, key, output_path, output):
+        artifact = os.path.join(self.cache_dir, key)
+        try:
+            with open(artifact + BUILD_CACHE_LOG_SUFFIX, "w", encoding="utf-8") as f:
+                f.write(output)
+            self.copy(output_path, artifact)
+        except OSError:
+            return
+        self.evict()
+
+    def copy(self, source, target):
+        # Through a temporary file, so nobody sees half an artifact
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target) or ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(source, temp_path)
+            shutil.copymode(source, temp_path)
+            os.replace(temp_path, target)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def evict(self):
+        # Drop the least recently used entries until the cache fits under max_bytes
+        with self.lock:
+            entries = {}
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        info = entry.stat()
+                    except OSError:
+                        continue
+                    key = entry.name.removesuffix(BUILD_CACHE_LOG_SUFFIX)
+                    used, size = entries.get(key, (0, 0))
+                    if key == entry.name:
+                        used = info.st_mtime_ns
+                    entries[key] = (used, size + info.st_size)
+                    total += info.st_size
+            for key, (used, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+                if total <= self.max_bytes:
+                    break
+                artifact = os.path.join(self.cache_dir, key)
+                for path in (artifact, artifact + BUILD_CACHE_LOG_SUFFIX):
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                total -= size
+
+    def stats(self):
+        with self.lock:
+            return f"{self.hits} hit(s), {self.misses} miss(es) this session"
+
+
+# ---------- Precompiled Headers ----------
+# The <...> includes a file starts with are compiled once into a header
+# named by a hash of the compiler identity, the flags and the include list,
+# then passed to later builds with -include: g++ and clang++ both pick up
+# the prefix.h.gch / prefix.h.pch next to it.
+PCH_SCAN_CHARS = 16 * 1024
+# Headers kept, least recently used dropped first; each can be 100+ MB
+PCH_MAX_ENTRIES = 4
+_SYSTEM_INCLUDE_RE = re.compile(r"#\s*include\s*(<[^>]+>)")
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+
+
+def leading_system_includes(text):
+    # The system headers included before anything else, comments and blank lines aside
+    headers = []
+    for line in _BLOCK_COMMENT_RE.sub(" ", text[:PCH_SCAN_CHARS]).splitlines():
+        line = line.split("//", 1)[0].strip()
+        if not line:
+            continue
+        match = _SYSTEM_INCLUDE_RE.fullmatch(line)
+        if not match:
+            break
+        headers.append(match.group(1))
+    return headers
+
+
+def precompiled_header_dir():
+    path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), "pch")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class PrecompiledHeaders:
+    def __init__(self, pch_dir):
+        self.pch_dir = pch_dir
+        self.lock = threading.Lock()
+        self.building = set()
+        self.failed = set()
+        # Background header builds outlive the build that asked for them
+        self.processes = BuildProcesses()
+
+    def prepare(self, compiler, flags, headers, run=subprocess.run):
+        # Returns the header to pass with -include (None to build without one) and lines for
+        # the log. A missing header is compiled in the background, for the builds after this one.
+        if os.path.splitext(os.path.basename(compiler))[0].lower() == "cl":
+            return None, []  # MSVC precompiles with /Yc and /Yu instead
+        identity = compiler_identity(compiler, run)
+        digest = hashlib.sha256()
+        for part in (identity, flags.encode("utf-8"), "\n".join(headers).encode("utf-8")):
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+        entry = os.path.join(self.pch_dir, digest.hexdigest())
+        prefix = os.path.join(entry, "prefix.h")
+        compiled = prefix + (".pch" if b"clang" in identity else ".gch")
+        names = " ".join(headers)
+        with self.lock:
+            if os.path.exists(compiled):
+                os.utime(compiled)
+                return prefix, [f"📦 Using precompiled {names}"]
+            if entry in self.building or entry in self.failed:
+                return None, []
+            self.building.add(entry)
+        threading.Thread(target=self.build, args=(compiler, flags, headers, entry, prefix, compiled),
+                         daemon=True).start()
+        return None, [f"📦 Precompiling {names} in the background for the next build"]
+
+    def build(self, compiler, flags, headers, entry, prefix, compiled):
+        try:
+            os.makedirs(entry, exist_ok=True)
+            with open(prefix, "w", encoding="utf-8") as f:
+                f.write("".join(f"#include {header}\n" for header in headers))
+            # Written beside the final name, then moved, so a build never sees half a header
+            temp_path = f"{compiled}.{os.getpid()}.tmp"
+            result = self.processes.run(f'{compiler} -x c++-header "{prefix}" -o "{temp_path}" {flags}',
+                                        shell=True, capture_output=True)
+            if result.returncode != 0:
+                # Not retried this session: the build itself reports what is wrong
+                shutil.rmtree(entry, ignore_errors=True)
+                with self.lock:
+                    self.failed.add(entry)
+                return
+            os.replace(temp_path, compiled)
+            self.evict()
+        except OSError:
+            shutil.rmtree(entry, ignore_errors=True)
+        finally:
+            with self.lock:
+                self.building.discard(entry)
+
+    def cancel(self):
+        # Kills the header builds still running; none start afterwards
+        self.processes.cancel()
+
+    def evict(self):
+        # Keep the most recently used headers; one being built has no compiled file yet and is skipped
+        entries = []
+        with os.scandir(self.pch_dir) as it:
+            for entry in it:
+                try:
+                    used = max(os.stat(os.path.join(entry.path, name)).st_mtime_ns
+                               for name in os.listdir(entry.path) if name.endswith((".gch", ".pch")))
+                except (OSError, ValueError):
+                    continue
+                entries.append((used, entry.path))
+        for _, path in sorted(entries, reverse=True)[PCH_MAX_ENTRIES:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# ---------- Project Build ----------
+PROJECT_SOURCE_SUFFIXES = frozenset([".cpp", ".cxx", ".cc", ".c"])
+# Objects, depfiles and the linked program live here, under the working directory
+PROJECT_BUILD_DIR = ".build"
+# Slowest units listed after a build
+PROJECT_TIMING_REPORT = 10
+
+
+def read_depfile(dep_path):
+    # Prerequisites of a make-style depfile written by -MMD
+    with open(dep_path, encoding="utf-8", errors="replace") as f:
+        text = f.read().replace("\\\n", " ")
+    _, _, prerequisites = text.partition(": ")
+    return [path.replace("\\ ", " ").replace("$$", "$")
+            for path in re.split(r"(?<!\\)\s+", prerequisites) if path]
+
+
+def project_output_path(root):
+    name = os.path.basename(os.path.normpath(root)) or "program"
+    return os.path.join(root, PROJECT_BUILD_DIR, name + (".exe" if sys.platform == "win32" else ""))
+
+
+class ProjectBuildThread(QThread):
+    # Same signals as CompilationThread, so the window reports both alike
+    output_received = Signal(list)
+    compilation_finished = Signal(int, str, float)  # return_code, first error lines, seconds
+
+    def __init__(self, root, compiler, flags, cache=None):
+        super().__init__()
+        self.root = root
+        self.compiler = compiler
+        self.flags = flags
+        self.cache = cache
+        self.processes = BuildProcesses()
+        self.build_dir = os.path.join(root, PROJECT_BUILD_DIR)
+        self.output_path = project_output_path(root)
+        self.workers = os.cpu_count() or 1
+        self.forwarded = 0
+        self.dropped = 0
+
+    def run(self):
+        started = time.perf_counter()
+        sources = sorted(entry.path for entry in walk_files(self.root, self.isInterruptionRequested)
+                         if os.path.splitext(entry.name)[1].lower() in PROJECT_SOURCE_SUFFIXES)
+        if not sources:
+            self.compilation_finished.emit(1, f"No C/C++ sources found under {self.root}", 0.0)
+            return
+        units = []
+        for source in sources:
+            base = os.path.join(self.build_dir, "objects", os.path.relpath(source, self.root))
+            units.append((source, base + ".o", base + ".d"))
+
+        # Objects built with other flags are all out of date; the stamp is
+        # only written once every unit has compiled with the current ones
+        stamp_path = os.path.join(self.build_dir, "command")
+        command = f"{self.compiler} {self.flags}"
+        try:
+            with open(stamp_path, encoding="utf-8") as f:
+                rebuild_all = f.read() != command
+        except OSError:
+            rebuild_all = True
+        stale = [unit for unit in units if rebuild_all or self.is_stale(*unit)]
+        self.emit_lines([f"{len(units)} translation unit(s), {len(stale)} to compile "
+                         f"on {self.workers} worker(s)"])
+
+        errors = ""
+        timings = []
+        restored = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [pool.submit(self.compile_unit, *unit) for unit in stale]
+            for future in as_completed(futures):
+                if self.isInterruptionRequested():
+                    break
+                source, return_code, output, seconds, cached = future.result()
+                timings.append((seconds, source))
+                restored += cached
+                status = "✔" if return_code == 0 else "✘"
+                self.emit_lines([f"[{len(timings)}/{len(stale)}] {status} "
+                                 f"{os.path.relpath(source, self.root)} ({seconds:.2f} s"
+                                 f"{', cached' if cached else ''})"]
+                                + output.splitlines())
+                if return_code != 0 and not errors:
+                    errors = "".join(output.splitlines(True)[:COMPILE_ERROR_PREVIEW_LINES]) or "failed"
+                if errors or self.isInterruptionRequested():
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        compiled = time.perf_counter() - started
+        if errors or self.isInterruptionRequested():
+            self.finish(1, errors or "Build cancelled", started)
+            return
+        if stale:
+            with open(stamp_path, "w", encoding="utf-8") as f:
+                f.write(command)
+
+        # Link when any object is newer than the program
+        link_seconds = 0.0
+        objects = [obj for _, obj, _ in units]
+        if stale or self.is_stale(None, self.output_path, None, objects):
+            link_started = time.perf_counter()
+            object_list = " ".join(f'"{obj}"' for obj in objects)
+            result = self.processes.run(f'{self.compiler} {object_list} -o "{self.output_path}" {self.flags}',
+                                        shell=True, capture_output=True, text=True, errors="replace")
+            link_seconds = time.perf_counter() - link_started
+            output = result.stdout + result.stderr
+            self.emit_lines([f"Linked {os.path.relpath(self.output_path, self.root)} ({link_seconds:.2f} s)"]
+                            + output.splitlines())
+            if result.returncode != 0:
+                self.finish(result.returncode,
+                            "".join(output.splitlines(True)[:COMPILE_ERROR_PREVIEW_LINES]), started)
+                return
+
+        report = [f"Compiled {len(stale)} of {len(units)} unit(s) in {compiled:.2f} s, "
+                  f"linked in {link_seconds:.2f} s"]
+        if self.cache and stale:
+            report.append(f"🗃️ {restored} of {len(stale)} unit(s) restored from the build cache "
+                          f"({self.cache.stats()})")
+        for seconds, source in sorted(timings, reverse=True)[:PROJECT_TIMING_REPORT]:
+            report.append(f"  {seconds:7.2f} s  {os.path.relpath(source, self.root)}")
+        self.emit_lines(report)
+        self.finish(0, "", started)
+
+    def is_stale(self, source, target, dep_path, prerequisites=None):
+        # Out of date when the target is missing or older than anything it was built from
+        try:
+            built = os.stat(target).st_mtime_ns
+            if prerequisites is None:
+                prerequisites = read_depfile(dep_path) + [source]
+        except OSError:
+            return True
+        for path in prerequisites:
+            try:
+                if os.stat(path).st_mtime_ns > built:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def compile_unit(self, source, obj, dep_path):
+        started = time.perf_counter()
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        key = None
+        if self.cache:
+            # Preprocessing writes the depfile too, so a restored object still tracks its headers
+            key = self.cache.key(self.compiler, self.flags, source, "object",
+                                 f'-MMD -MF "{dep_path}" -MT "{obj}"', self.processes.run)
+            output = self.cache.fetch(key, obj) if key else None
+            if output is not None:
+                return source, 0, output, time.perf_counter() - started, True
+        result = self.processes.run(f'{self.compiler} -c "{source}" -o "{obj}" -MMD -MF "{dep_path}" {self.flags}',
+                                    shell=True, capture_output=True, text=True, errors="replace")
+        output = result.stdout + result.stderr
+        if key and result.returncode == 0:
+            self.cache.store(key, obj, output)
+        return source, result.returncode, output, time.perf_counter() - started, False
+
+    def cancel(self):
+        # Kills every running compile with everything it started
+        self.requestInterruption()
+        self.processes.cancel()
+
+    def emit_lines(self, lines):
+        # Capped like CompilationThread's output
+        room = COMPILE_OUTPUT_MAX_LINES - self.forwarded
+        self.dropped += max(0, len(lines) - room)
+        lines = [line[:COMPILE_OUTPUT_MAX_LINE_CHARS] for line in lines[:max(0, room)]]
+        if lines:
+            self.forwarded += len(lines)
+            self.output_received.emit(lines)
+
+    def finish(self, return_code, errors, started):
+        if self.dropped:
+            self.output_received.emit([f"... {self.dropped} more line(s) not shown"])
+        self.compilation_finished.emit(return_code, errors, time.perf_counter() - started)
+
+
+# ---------- File Loader ----------
+# Python codec and status bar name for each encoding the loader can detect
+ENCODING_NAMES = {
+    "utf-8": "UTF-8",
+    "utf-8-sig": "UTF-8 with BOM",
+    "utf-16": "UTF-16",
+    "utf-32": "UTF-32",
+    "latin-1": "Latin-1",
+}
+LOAD_CHUNK_SIZE = 512 * 1024
+
+
+def detect_bom(head):
+    if head.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return "utf-32"
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    return None
+
+
+class FileLoaderSignals(QObject):
+    chunk_loaded = Signal(str, int, int)  # text, bytes read, total bytes
+    restarted = Signal(str)               # encoding; text loaded so far is invalid
+    finished = Signal(str, object)        # encoding, disk state of the file as it was read
+    failed = Signal(str)
+
+
+class FileLoader(QRunnable):
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = FileLoaderSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            with open(self.file_path, 'rb') as f:
+                # Taken from the open file, so it describes the bytes read
+                stat = os.fstat(f.fileno())
+                state = (stat.st_size, stat.st_mtime_ns)
+                encoding = detect_bom(f.read(4)) or "utf-8"
+                try:
+                    self.stream(f, encoding)
+                except UnicodeDecodeError:
+                    # Not UTF-8 after all: every byte is valid Latin-1
+                    encoding = "latin-1"
+                    self.signals.restarted.emit(encoding)
+                    self.stream(f, encoding)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(encoding, state)
+
+    def stream(self, f, encoding):
+        total = os.fstat(f.fileno()).st_size
+        f.seek(0)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        pending_cr = ""
+        read = 0
+        while not self.cancelled:
+            data = f.read(LOAD_CHUNK_SIZE)
+            read += len(data)
+            text = pending_cr + decoder.decode(data, final=not data)
+            # Hold back a trailing CR in case its LF starts the next chunk
+            pending_cr = "\r" if text.endswith("\r") and data else ""
+            if pending_cr:
+                text = text[:-1]
+            if text:
+                self.signals.chunk_loaded.emit(text.replace("\r\n", "\n").replace("\r", "\n"), read, total)
+            if not data:
+                break
+
+
+# ---------- File Watcher ----------
+# Milliseconds to wait for a burst of changes (checkout, formatter) to settle
+FILE_CHANGE_DELAY = 300
+
+
+def disk_state(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class ReloadSignals(QObject):
+    diffed = Signal(str, int, object, object)  # file path, revision, changes, disk state
+    failed = Signal(str, str)
+
+
+class ReloadDiffer(QRunnable):
+    # Reads the changed file and diffs it by line against a snapshot of the
+    # document; changes are (first line, end line, new lines), bottom up
+    def __init__(self, file_path, text, revision, encoding):
+        super().__init__()
+        self.file_path = file_path
+        self.text = text
+        self.revision = revision
+        self.encoding = encoding
+        self.signals = ReloadSignals()
+
+    def run(self):
+        try:
+            state = disk_state(self.file_path)
+            with open(self.file_path, 'rb') as f:
+                text = f.read().decode(self.encoding)
+        except Exception as e:
+            self.signals.failed.emit(self.file_path, str(e))
+            return
+        old_lines = self.text.split("\n")
+        new_lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+        changes = [(i1, i2, new_lines[j1:j2])
+                   for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()) if tag != "equal"]
+        self.signals.diffed.emit(self.file_path, self.revision, changes, state)
+
+
+# ---------- Edit Journal ----------
+# A journal starts with a header naming the file, then a base record: the
+# file on disk ('F', size, mtime) or a compacted text snapshot ('T'). Each
+# edit from contentsChange is appended as ('E', position, removed, text).
+JOURNAL_MAGIC = b"CPPJ\x01"
+JOURNAL_SUFFIX = ".journal"
+# Compact once the edits outgrow the base record and this many bytes
+JOURNAL_COMPACT_SIZE = 256 * 1024
+_EDIT_RECORD = struct.Struct("<cIII")
+_FILE_RECORD = struct.Struct("<cQQ")
+_TEXT_RECORD = struct.Struct("<cI")
+
+
+def journal_dir():
+    path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), "journals")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class EditJournal:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.journal_path = os.path.join(
+            journal_dir(), hashlib.sha1(file_path.encode("utf-8")).hexdigest() + JOURNAL_SUFFIX)
+        self.file = None
+        self.size = 0
+        self.base_size = 0
+        # Records appended while a compacted copy is being written
+        self.pending = None
+
+    def header(self):
+        path = self.file_path.encode("utf-8")
+        return JOURNAL_MAGIC + struct.pack("<H", len(path)) + path
+
+    def start(self, text=None):
+        # Journal edits against the file as it is on disk, or against a text snapshot
+        if text is None:
+            stat = os.stat(self.file_path)
+            data = self.header() + _FILE_RECORD.pack(b"F", stat.st_size, stat.st_mtime_ns)
+        else:
+            data = self.text_base(text)
+        with open(self.journal_path, "wb") as f:
+            f.write(data)
+        self.resume(len(data))
+
+    def resume(self, base_size):
+        self.file = open(self.journal_path, "ab")
+        self.size = self.file.tell()
+        self.base_size = base_size
+
+    def record(self, position, removed, text):
+        data = text.encode("utf-8", "surrogatepass")
+        record = _EDIT_RECORD.pack(b"E", position, removed, len(data)) + data
+        self.file.write(record)
+        self.file.flush()
+        self.size += len(record)
+        if self.pending is not None:
+            self.pending.append(record)
+
+    def needs_compaction(self):
+        return self.pending is None and self.size - self.base_size > max(JOURNAL_COMPACT_SIZE, self.base_size)
+
+    def text_base(self, text):
+        data = zlib.compress(text.encode("utf-8", "surrogatepass"), 1)
+        return self.header() + _TEXT_RECORD.pack(b"T", len(data)) + data
+
+    def snapshot(self, text):
+        # Returns the compacted journal; edits made until finish_compaction are kept aside
+        self.pending = []
+        return self.text_base(text)
+
+    def finish_compaction(self, temp_path, base_size):
+        with open(temp_path, "ab") as f:
+            f.write(b"".join(self.pending))
+        self.pending = None
+        self.file.close()
+        os.replace(temp_path, self.journal_path)
+        self.resume(base_size)
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def read(journal_path):
+        # Returns (file path, base, edits); a torn final record is dropped
+        with open(journal_path, "rb") as f:
+            data = f.read()
+        if not data.startswith(JOURNAL_MAGIC):
+            raise ValueError("not an edit journal")
+        pos = len(JOURNAL_MAGIC)
+        (length,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        file_path = data[pos:pos + length].decode("utf-8")
+        pos += length
+        if data[pos:pos + 1] == b"F":
+            _, size, mtime = _FILE_RECORD.unpack_from(data, pos)
+            base = (size, mtime)
+            pos += _FILE_RECORD.size
+        else:
+            _, length = _TEXT_RECORD.unpack_from(data, pos)
+            pos += _TEXT_RECORD.size
+            base = zlib.decompress(data[pos:pos + length]).decode("utf-8", "surrogatepass")
+            pos += length
+        base_size = pos
+        edits = []
+        while pos + _EDIT_RECORD.size <= len(data):
+            _, position, removed, length = _EDIT_RECORD.unpack_from(data, pos)
+            end = pos + _EDIT_RECORD.size + length
+            if end > len(data):
+                break
+            edits.append((position, removed, data[end - length:end].decode("utf-8", "surrogatepass")))
+            pos = end
+        return file_path, base, base_size, edits
+
+
+class JournalSignals(QObject):
+    written = Signal(str, str, int)  # file path, temp path, base size
+    failed = Signal(str, str)
+
+
+class JournalWriter(QRunnable):
+    # Writes a compacted journal next to the live one; the GUI thread swaps it in
+    def __init__(self, journal, data, base_size):
+        super().__init__()
+        self.file_path = journal.file_path
+        self.temp_path = journal.journal_path + ".tmp"
+        self.data = data
+        self.base_size = base_size
+        self.signals = JournalSignals()
+
+    def run(self):
+        try:
+            with open(self.temp_path, "wb") as f:
+                f.write(self.data)
+        except Exception as e:
+            self.signals.failed.emit(self.file_path, str(e))
+            return
+        self.signals.written.emit(self.file_path, self.temp_path, self.base_size)
+
+
+# ---------- Save Queue ----------
+# mkstemp creates files as 0600; new files get the usual umask permissions.
+# The umask can only be read by setting it, so this happens once at startup.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class SaveFuture:
+    # Completed on the GUI thread with None, or the error message if the write failed
+    def __init__(self):
+        self.done = False
+        self.error = None
+        self.callbacks = []
+
+    def add_done_callback(self, callback):
+        if self.done:
+            callback(self.error)
+        else:
+            self.callbacks.append(callback)
+
+    def set_result(self, error):
+        self.done = True
+        self.error = error
+        for callback in self.callbacks:
+            callback(error)
+
+
+class SaveSignals(QObject):
+    finished = Signal(str, str)  # file path, error ("" on success)
+
+
+class SaveWriter(QRunnable):
+    def __init__(self, file_path, text, encoding):
+        super().__init__()
+        self.file_path = file_path
+        self.text = text
+        self.encoding = encoding
+        self.signals = SaveSignals()
+
+    def run(self):
+        # Write beside the target, flush it to disk, then rename over it so
+        # the file is either the old or the new version, never a torn one.
+        # A symlink is followed so the file it points at is replaced.
+        target = os.path.realpath(self.file_path)
+        directory, name = os.path.split(target)
+        temp = None
+        try:
+            fd, temp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, 'w', encoding=self.encoding) as f:
+                f.write(self.text)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(target):
+                os.chmod(temp, stat.S_IMODE(os.stat(target).st_mode))
+            else:
+                os.chmod(temp, 0o666 & ~_UMASK)
+            os.replace(temp, target)
+        except Exception as e:
+            if temp:
+                try:
+                    os.remove(temp)
+                except OSError:
+                    pass
+            self.signals.finished.emit(self.file_path, str(e) or type(e).__name__)
+            return
+        self.signals.finished.emit(self.file_path, "")
+
+
+class SaveQueue(QObject):
+    # One write per file at a time; saves requested meanwhile are merged
+    # into a single follow-up write of the newest text
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.active = {}   # file path -> future of the write in flight
+        self.pending = {}  # file path -> (text, encoding, future)
+
+    def save(self, file_path, text, encoding):
+        if file_path in self.active:
+            future = self.pending[file_path][2] if file_path in self.pending else SaveFuture()
+            self.pending[file_path] = (text, encoding, future)
+            return future
+        future = SaveFuture()
+        self.start(file_path, text, encoding, future)
+        return future
+
+    def future(self, file_path):
+        # The write that will leave the newest queued text on disk, if any
+        if file_path in self.pending:
+            return self.pending[file_path][2]
+        return self.active.get(file_path)
+
+    def start(self, file_path, text, encoding, future):
+        writer = SaveWriter(file_path, text, encoding)
+        writer.signals.finished.connect(self.on_finished)
+        self.active[file_path] = future
+        QThreadPool.globalInstance().start(writer)
+
+    def on_finished(self, file_path, error):
+        future = self.active.pop(file_path)
+        if file_path in self.pending:
+            self.start(file_path, *self.pending.pop(file_path))
+        future.set_result(error or None)
+
+    def busy(self):
+        return bool(self.active)
+
+
+# ---------- Auto Save ----------
+# Seconds to wait after the last edit, and the longest a dirty document waits
+AUTO_SAVE_DELAY = 2.0
+AUTO_SAVE_MAX_DELAY = 30.0
+
+
+class AutoSaveScheduler(QObject):
+    # One timer for all tabs: edits are journaled as they happen, and once a
+    # document goes quiet its journal is compacted on the thread pool
+    failed = Signal(str, str)
+
+    def __init__(self, journal_of, parent=None):
+        super().__init__(parent)
+        self.journal_of = journal_of
+        self.dirty = {}  # editor -> (first edit time, deadline)
+        # Writers in flight; their signals must outlive the pool's reference
+        self.writers = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush_due)
+
+    def watch(self, editor):
+        editor.document().contentsChange.connect(
+            lambda position, removed, added: (removed or added) and self.touch(editor))
+
+    def touch(self, editor):
+        if editor.loader:
+            return
+        now = time.monotonic()
+        first = self.dirty.get(editor, (now, 0))[0]
+        self.dirty[editor] = (first, min(now + AUTO_SAVE_DELAY, first + AUTO_SAVE_MAX_DELAY))
+        self.schedule()
+
+    def forget(self, editor, flush=False):
+        if flush and editor in self.dirty:
+            self.write(editor)
+        self.dirty.pop(editor, None)
+
+    def schedule(self):
+        if self.dirty:
+            deadline = min(deadline for _, deadline in self.dirty.values())
+            self.timer.start(max(0, int((deadline - time.monotonic()) * 1000)))
+
+    def flush_due(self):
+        now = time.monotonic()
+        for editor, (_, deadline) in list(self.dirty.items()):
+            if deadline <= now:
+                self.write(editor)
+                del self.dirty[editor]
+        self.schedule()
+
+    def write(self, editor):
+        journal = self.journal_of(editor)
+        if journal is None or not journal.needs_compaction():
+            return
+        data = journal.snapshot(editor.toPlainText())
+        writer = JournalWriter(journal, data, len(data))
+        writer.signals.written.connect(lambda file_path, temp_path, base_size:
+                                       self.on_written(writer, journal, temp_path, base_size))
+        writer.signals.failed.connect(lambda file_path, error: self.on_failed(writer, journal, error))
+        self.writers.add(writer)
+        QThreadPool.globalInstance().start(writer)
+
+    def on_written(self, writer, journal, temp_path, base_size):
+        self.writers.discard(writer)
+        if journal.file.closed:
+            # Discarded while the copy was written
+            os.remove(temp_path)
+            return
+        journal.finish_compaction(temp_path, base_size)
+
+    def on_failed(self, writer, journal, error):
+        self.writers.discard(writer)
+        journal.pending = None
+        self.failed.emit(journal.file_path, error)
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
 
 
 # ---------- Settings Dialog ----------
@@ -64,6 +1186,32 @@ class SettingsDialog(QDialog):
         self.auto_indent_check.setChecked(True)
         editor_layout.addRow("Auto Indent:", self.auto_indent_check)
 
+        self.syntax_theme_combo = QComboBox()
+        self.syntax_theme_combo.addItems(list(SYNTAX_THEMES))
+        editor_layout.addRow("Syntax Theme:", self.syntax_theme_combo)
+
+        self.background_lexing_check = QCheckBox("Tokenize on a background thread")
+        editor_layout.addRow("Highlighting:", self.background_lexing_check)
+
+        self.highlight_max_spin = QSpinBox()
+        self.highlight_max_spin.setRange(1, 1024)
+        self.highlight_max_spin.setSuffix(" MB")
+        editor_layout.addRow("Highlight Files Up To:", self.highlight_max_spin)
+
+        self.large_file_spin = QSpinBox()
+        self.large_file_spin.setRange(1, 4096)
+        self.large_file_spin.setSuffix(" MB")
+        editor_layout.addRow("Read-Only View Above:", self.large_file_spin)
+
+        self.live_tabs_spin = QSpinBox()
+        self.live_tabs_spin.setRange(1, 500)
+        editor_layout.addRow("Hibernate Tabs Beyond:", self.live_tabs_spin)
+
+        self.tab_memory_spin = QSpinBox()
+        self.tab_memory_spin.setRange(16, 16384)
+        self.tab_memory_spin.setSuffix(" MB")
+        editor_layout.addRow("Tab Memory Budget:", self.tab_memory_spin)
+
         editor_tab = QWidget()
         editor_tab.setLayout(editor_layout)
         tabs.addTab(editor_tab, "📝 Editor")
@@ -83,6 +1231,20 @@ class SettingsDialog(QDialog):
         self.run_in_cmd_check.setChecked(True)
         build_layout.addRow(self.run_in_cmd_check)
 
+        self.build_cache_spin = QSpinBox()
+        self.build_cache_spin.setRange(0, 65536)
+        self.build_cache_spin.setSuffix(" MB")
+        self.build_cache_spin.setSpecialValueText("Off")
+        build_layout.addRow("Build Cache Size:", self.build_cache_spin)
+
+        self.precompiled_headers_check = QCheckBox("Precompile leading system headers")
+        self.precompiled_headers_check.setChecked(True)
+        build_layout.addRow(self.precompiled_headers_check)
+
+        self.syntax_check_check = QCheckBox("Check syntax while typing")
+        self.syntax_check_check.setChecked(True)
+        build_layout.addRow(self.syntax_check_check)
+
         build_tab = QWidget()
         build_tab.setLayout(build_layout)
         tabs.addTab(build_tab, "🔨 Build")
@@ -98,6 +1260,9 @@ class SettingsDialog(QDialog):
         self.setLayout(main_layout)
 
 # ---------- Find/Replace Dialog ----------
+LIVE_SEARCH_DELAY = 150
+
+
 class FindReplaceDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -120,11 +1285,17 @@ class FindReplaceDialog(QDialog):
         # Options
         self.case_sensitive_check = QCheckBox("Case Sensitive")
         self.whole_word_check = QCheckBox("Whole Word")
+        self.regex_check = QCheckBox("Regex")
         
         options_layout = QHBoxLayout()
         options_layout.addWidget(self.case_sensitive_check)
         options_layout.addWidget(self.whole_word_check)
+        options_layout.addWidget(self.regex_check)
         layout.addRow("Options:", options_layout)
+
+        # Match count and errors, shown here instead of in message boxes
+        self.status_label = QLabel()
+        layout.addRow("", self.status_label)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -141,6 +1312,785 @@ class FindReplaceDialog(QDialog):
         main_layout.addLayout(button_layout)
         self.setLayout(main_layout)
 
+    def pattern(self):
+        # Raises re.error for an invalid regular expression
+        return search_pattern(self.find_edit.toPlainText(), self.case_sensitive_check.isChecked(),
+                              self.whole_word_check.isChecked(), self.regex_check.isChecked())
+
+    def replacement(self, match):
+        # Regex replacements expand \1 and \g<name>; plain ones are literal
+        text = self.replace_edit.toPlainText()
+        return match.expand(text) if self.regex_check.isChecked() else text
+
+
+def search_pattern(text, case_sensitive=False, whole_word=False, regex=False):
+    # One matcher for find, replace and highlighting; ^ and $ anchor at
+    # line breaks whether a single line or the whole text is searched
+    pattern = text if regex else re.escape(text)
+    if whole_word:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern, re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE)
+
+
+def next_match(pattern, text, position):
+    # First non-empty match from position on, wrapping to the top of the text
+    for start in (position, 0):
+        for match in pattern.finditer(text, start):
+            if match.end() > match.start():
+                return match
+    return None
+
+
+def astral_positions(text):
+    # Offsets of the characters Qt counts as two UTF-16 units
+    return [] if text.isascii() else [m.start() for m in _ASTRAL_RE.finditer(text)]
+
+
+def from_utf16(astral, position):
+    # Code point offset of a Qt position in the text with these astral_positions
+    return position - bisect_left([offset + i for i, offset in enumerate(astral)], position)
+
+
+# ---------- Find in Files ----------
+SEARCH_IGNORED_DIRS = frozenset([
+    ".git", ".hg", ".svn", ".vs", ".vscode", ".idea", ".cache", ".venv", "venv",
+    "__pycache__", "node_modules", "CMakeFiles", PROJECT_BUILD_DIR,
+])
+SEARCH_SKIPPED_SUFFIXES = frozenset([
+    ".o", ".obj", ".a", ".lib", ".so", ".dll", ".dylib", ".exe", ".pdb", ".ilk",
+    ".gch", ".pch", ".zip", ".gz", ".xz", ".7z", ".png", ".jpg", ".gif", ".ico", ".pdf",
+])
+SEARCH_BATCH_FILES = 64
+SEARCH_MAX_FILE_SIZE = 64 * 1024 * 1024
+SEARCH_MAX_FILE_MATCHES = 1000
+SEARCH_MAX_MATCHES = 10000
+SEARCH_PREVIEW_BYTES = 240
+# Trigram index of the working directory, persisted between sessions
+SEARCH_INDEX_VERSION = 1
+SEARCH_INDEX_START_DELAY = 2000
+SEARCH_INDEX_UPDATE_DELAY = 500
+SEARCH_INDEX_RESYNC_SECONDS = 60
+SEARCH_INDEX_MAX_WATCHES = 4096
+
+
+def walk_files(root, interrupted=lambda: False, directories=None, skip=frozenset()):
+    # Yields a DirEntry for every searchable file under root; visited
+    # directories are appended to directories when it is given, and the
+    # subdirectories in skip are not entered
+    pending = [root]
+    while pending and not interrupted():
+        directory = pending.pop()
+        if directories is not None:
+            directories.append(directory)
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SEARCH_IGNORED_DIRS and entry.path not in skip:
+                                pending.append(entry.path)
+                        elif (entry.is_file()
+                              and os.path.splitext(entry.name)[1].lower() not in SEARCH_SKIPPED_SUFFIXES):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def search_files(file_paths, pattern, flags):
+    # Runs in a worker process: maps each file and scans the raw bytes, so
+    # nothing is decoded except the lines that match
+    regex = re.compile(pattern, flags)
+    results = []
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size or size > SEARCH_MAX_FILE_SIZE:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if b"\0" in data[:8192]:
+                        continue  # binary
+                    matches = []
+                    line, counted = 1, 0
+                    for match in regex.finditer(data):
+                        start, end = match.span()
+                        if start == end:
+                            continue
+                        line += data[counted:start].count(b"\n")
+                        counted = start
+                        line_start = data.rfind(b"\n", 0, start) + 1
+                        line_end = data.find(b"\n", start)
+                        line_end = size if line_end < 0 else line_end
+                        # Columns and lengths in UTF-16 units, as the editor counts them
+                        prefix = data[line_start:start].decode('utf-8', 'replace')
+                        found = data[start:min(end, line_end)].decode('utf-8', 'replace')
+                        preview = data[line_start:min(line_end, line_start + SEARCH_PREVIEW_BYTES)]
+                        matches.append((line, len(prefix) + len(_ASTRAL_RE.findall(prefix)),
+                                         len(found) + len(_ASTRAL_RE.findall(found)),
+                                         preview.decode('utf-8', 'replace').rstrip("\r")))
+                        if len(matches) >= SEARCH_MAX_FILE_MATCHES:
+                            break
+                    if matches:
+                        results.append((file_path, matches))
+        except (OSError, ValueError):
+            continue
+    return len(file_paths), results
+
+
+class FileSearchThread(QThread):
+    matches_found = Signal(list)  # [(file path, [(line, column, length, preview)])]
+    search_finished = Signal(int, int, bool)  # files searched, matches, stopped early
+    failed = Signal(str)
+
+    def __init__(self, pool, root, pattern, flags, candidates=None, index=None, stale=(), watched=frozenset()):
+        super().__init__()
+        self.pool = pool
+        self.root = root
+        self.pattern = pattern
+        self.flags = flags
+        # Files picked by the trigram index; None walks the whole tree
+        self.candidates = candidates
+        self.index = index
+        # Directories the index may be behind on, and the watched ones, which are not
+        self.stale = stale
+        self.watched = watched
+        self.files = 0
+        self.matches = 0
+
+    def batches(self):
+        if self.candidates is not None:
+            paths = chain(self.candidates, self.unindexed())
+        else:
+            paths = (entry.path for entry in walk_files(self.root, self.isInterruptionRequested))
+        batch = list(islice(paths, SEARCH_BATCH_FILES))
+        while batch:
+            yield batch
+            batch = list(islice(paths, SEARCH_BATCH_FILES))
+
+    def unindexed(self):
+        # Files the index has not seen as they are now, looked for only in the
+        # stale directories and the new, unwatched directories below them
+        seen = set(self.candidates)
+        visited = set()
+        for directory in self.stale:
+            if directory in visited:
+                continue
+            directories = []
+            for entry in walk_files(directory, self.isInterruptionRequested, directories, self.watched):
+                if entry.path in seen:
+                    continue
+                seen.add(entry.path)
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if not self.index.is_current(entry.path, stat.st_size, stat.st_mtime_ns):
+                    yield entry.path
+            visited.update(directories)
+
+    def run(self):
+        # Batches go out while the tree is still being walked, and results
+        # stream back as each one completes
+        pending = set()
+        limit = 4 * (os.cpu_count() or 1)
+        try:
+            for batch in self.batches():
+                pending.add(self.pool.submit(search_files, batch, self.pattern, self.flags))
+                while len(pending) >= limit and not self.stopped():
+                    pending = self.collect(pending)
+                if self.stopped():
+                    break
+            while pending and not self.stopped():
+                pending = self.collect(pending)
+        except (BrokenExecutor, RuntimeError, OSError) as e:
+            # The pool could not start a worker or lost one
+            self.failed.emit(str(e) or "search worker exited")
+        finally:
+            for future in pending:
+                future.cancel()
+        self.search_finished.emit(self.files, self.matches, self.stopped())
+
+    def stopped(self):
+        return self.isInterruptionRequested() or self.matches >= SEARCH_MAX_MATCHES
+
+    def collect(self, pending):
+        # Wait briefly so a cancel request is noticed even while workers are busy
+        done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+        found = []
+        for future in done:
+            files, results = future.result()
+            self.files += files
+            for file_path, matches in results:
+                matches = matches[:max(0, SEARCH_MAX_MATCHES - self.matches)]
+                if matches:
+                    self.matches += len(matches)
+                    found.append((file_path, matches))
+        if found and not self.isInterruptionRequested():
+            self.matches_found.emit(found)
+        return pending
+
+
+def required_literals(text, regex=False, case_sensitive=False):
+    # Literal runs every match must contain, for narrowing a search with the
+    # trigram index; an empty list means the index cannot help. Only text
+    # outside groups counts, since a group may be optional or alternated.
+    if not case_sensitive and not text.isascii():
+        # The index folds ASCII case only; a matcher folding more would
+        # find text whose trigrams were indexed under other bytes
+        return []
+    if not regex:
+        return [text]
+    literals = []
+    run = ""
+    depth = 0
+    i = 0
+    while i < len(text):
+        char = text[i]
+        i += 1
+        if char == "\\":
+            escaped = text[i:i + 1]
+            i += 1
+            if not escaped or escaped.isalnum():
+                # \w, \d, \b, back references and the like
+                literals.append(run)
+                run = ""
+                continue
+            char = escaped
+        elif char == "[":
+            if text[i:i + 1] == "^":
+                i += 1
+            if text[i:i + 1] == "]":
+                i += 1
+            while i < len(text) and text[i] != "]":
+                i += 2 if text[i] == "\\" else 1
+            i += 1
+            literals.append(run)
+            run = ""
+            continue
+        elif char == "(":
+            if text[i:i + 1] == "?" and "x" in text[i + 1:i + 8].split(")")[0]:
+                return []  # verbose patterns ignore whitespace
+            depth += 1
+            literals.append(run)
+            run = ""
+            continue
+        elif char == ")":
+            depth -= 1
+            continue
+        elif char == "|":
+            if depth == 0:
+                return []
+            continue
+        elif char in "*?{":
+            # The preceding character may not appear at all
+            if char == "{":
+                i = text.find("}", i) + 1 or len(text)
+            literals.append(run[:-1])
+            run = ""
+            continue
+        elif char in ".^$+":
+            literals.append(run)
+            run = ""
+            continue
+        if depth == 0:
+            run += char
+    literals.append(run)
+    return [literal for literal in literals if literal]
+
+
+def trigrams_of(literals):
+    # The index folds ASCII case and never spans a line break
+    trigrams = set()
+    for literal in literals:
+        data = literal.encode('utf-8').lower()
+        trigrams.update(data[i:i + 3] for i in range(len(data) - 2) if b"\n" not in data[i:i + 3])
+    return trigrams
+
+
+def search_index_path(root):
+    path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), "search_index")
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, hashlib.sha1(root.encode("utf-8")).hexdigest() + ".index")
+
+
+def index_files(file_paths, first_id):
+    # Runs in a worker process: returns the (path, size, mtime) of each file,
+    # numbered from first_id, and the ids of the files containing each trigram
+    files = []
+    postings = {}
+    for file_id, file_path in enumerate(file_paths, first_id):
+        try:
+            with open(file_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                data = f.read(SEARCH_MAX_FILE_SIZE + 1) if stat.st_size <= SEARCH_MAX_FILE_SIZE else b""
+        except OSError:
+            files.append(None)
+            continue
+        files.append((file_path, stat.st_size, stat.st_mtime_ns))
+        if len(data) > SEARCH_MAX_FILE_SIZE or b"\0" in data[:8192]:
+            continue  # never searched, so never a candidate
+        trigrams = set()
+        for line in set(data.lower().split(b"\n")):
+            trigrams.update(line[i:i + 3] for i in range(len(line) - 2))
+        for trigram in trigrams:
+            ids = postings.get(trigram)
+            if ids is None:
+                postings[trigram] = array("I", [file_id])
+            else:
+                ids.append(file_id)
+    return first_id, files, postings
+
+
+class TrigramIndex:
+    # Maps every three byte sequence to the ids of the files containing it.
+    # Changed or removed files leave dead ids in the postings until compact().
+    # Only the indexer thread modifies the index; lock guards the readers.
+    def __init__(self, root):
+        self.root = root
+        self.entries = []  # file id -> (path, size, mtime_ns), None once dead
+        self.files = {}  # path -> file id
+        self.postings = {}  # trigram -> array of file ids
+        self.dead = 0
+        self.ready = False
+        self.lock = threading.Lock()
+
+    def is_current(self, file_path, size, mtime_ns):
+        with self.lock:
+            file_id = self.files.get(file_path)
+            return file_id is not None and self.entries[file_id][1:] == (size, mtime_ns)
+
+    def reserve(self, count):
+        # Ids for files being indexed; they stay dead until add() fills them in
+        with self.lock:
+            first_id = len(self.entries)
+            self.entries.extend([None] * count)
+            self.dead += count
+        return first_id
+
+    def add(self, first_id, files, postings):
+        with self.lock:
+            for file_id, entry in enumerate(files, first_id):
+                if entry:
+                    self.entries[file_id] = entry
+                    self.files[entry[0]] = file_id
+                    self.dead -= 1
+            for trigram, ids in postings.items():
+                existing = self.postings.get(trigram)
+                if existing is None:
+                    self.postings[trigram] = ids
+                else:
+                    existing.extend(ids)
+
+    def remove(self, file_paths):
+        with self.lock:
+            for file_path in file_paths:
+                file_id = self.files.pop(file_path, None)
+                if file_id is not None:
+                    self.entries[file_id] = None
+                    self.dead += 1
+
+    def candidates(self, trigrams):
+        # Files that may match, or None when there is nothing to narrow by
+        if not trigrams:
+            return None
+        with self.lock:
+            postings = sorted((self.postings.get(trigram, ()) for trigram in trigrams), key=len)
+            ids = set(postings[0])
+            for file_ids in postings[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(file_ids)
+            return sorted(self.entries[i][0] for i in ids if self.entries[i])
+
+    def compact(self):
+        # Renumber the live files; built aside and swapped in, so readers
+        # only wait for the swap
+        live = [i for i, entry in enumerate(self.entries) if entry]
+        renumbered = array("i", [-1]) * len(self.entries)
+        for new_id, old_id in enumerate(live):
+            renumbered[old_id] = new_id
+        postings = {}
+        for trigram, ids in self.postings.items():
+            ids = array("I", [renumbered[i] for i in ids if renumbered[i] >= 0])
+            if ids:
+                postings[trigram] = ids
+        entries = [self.entries[i] for i in live]
+        with self.lock:
+            self.entries = entries
+            self.files = {entry[0]: i for i, entry in enumerate(entries)}
+            self.postings = postings
+            self.dead = 0
+
+    def save(self, index_path):
+        data = marshal.dumps((SEARCH_INDEX_VERSION, self.root, self.entries,
+                              {trigram: ids.tobytes() for trigram, ids in self.postings.items()}))
+        with open(index_path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(index_path + ".tmp", index_path)
+
+    @classmethod
+    def load(cls, index_path, root):
+        # Returns None when there is no usable index for root
+        try:
+            with open(index_path, "rb") as f:
+                version, saved_root, entries, postings = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != SEARCH_INDEX_VERSION or saved_root != root:
+            return None
+        index = cls(root)
+        index.entries = entries
+        index.files = {entry[0]: i for i, entry in enumerate(entries) if entry}
+        index.dead = len(entries) - len(index.files)
+        for trigram, data in postings.items():
+            ids = array("I")
+            ids.frombytes(data)
+            index.postings[trigram] = ids
+        return index
+
+
+class TrigramIndexer(QThread):
+    synced = Signal(str, int, int, float)  # directory, files indexed, files in the index, seconds
+    directories_found = Signal(list)
+    failed = Signal(str)
+
+    def __init__(self, pool, root):
+        super().__init__()
+        self.pool = pool
+        self.root = root
+        self.index = None
+        self.synced_at = 0
+        self.dirty = set()
+        # Directories reported as changed whose sync has not finished yet
+        self.unsynced = set()
+        self.condition = threading.Condition()
+
+    def refresh(self, directory):
+        with self.condition:
+            self.dirty.add(directory)
+            self.unsynced.add(directory)
+            self.condition.notify()
+
+    def stale_directories(self):
+        with self.condition:
+            return set(self.unsynced)
+
+    def stop(self):
+        self.requestInterruption()
+        with self.condition:
+            self.condition.notify()
+
+    def run(self):
+        # Load the saved index, bring it up to date with the tree, then
+        # follow the directories reported as changed
+        index_path = search_index_path(self.root)
+        self.index = TrigramIndex.load(index_path, self.root) or TrigramIndex(self.root)
+        try:
+            self.sync(self.root, index_path)
+            while not self.isInterruptionRequested():
+                with self.condition:
+                    while not self.dirty and not self.isInterruptionRequested():
+                        self.condition.wait()
+                self.msleep(SEARCH_INDEX_UPDATE_DELAY)  # let bursts of changes settle
+                with self.condition:
+                    dirty, self.dirty = sorted(self.dirty), set()
+                synced = []
+                for directory in dirty:
+                    if not any(directory.startswith(parent + os.sep) for parent in synced):
+                        self.sync(directory, index_path)
+                        synced.append(directory)
+                with self.condition:
+                    # Unless they were reported again meanwhile
+                    self.unsynced = {directory for directory in self.unsynced if directory in self.dirty
+                                     or not any(directory == parent or directory.startswith(parent + os.sep)
+                                                for parent in synced)}
+        except (BrokenExecutor, RuntimeError, OSError) as e:
+            self.failed.emit(str(e) or "index worker exited")
+
+    def sync(self, directory, index_path):
+        started = time.perf_counter()
+        index = self.index
+        directories = []
+        seen = set()
+        changed = []
+        for entry in walk_files(directory, self.isInterruptionRequested, directories):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen.add(entry.path)
+            if not index.is_current(entry.path, stat.st_size, stat.st_mtime_ns):
+                changed.append(entry.path)
+        if self.isInterruptionRequested():
+            return
+        prefix = os.path.join(directory, "")
+        removed = [file_path for file_path in index.files if file_path.startswith(prefix) and file_path not in seen]
+        index.remove(removed + changed)
+
+        batches = (changed[i:i + SEARCH_BATCH_FILES] for i in range(0, len(changed), SEARCH_BATCH_FILES))
+        limit = 4 * (os.cpu_count() or 1)
+        pending = set()
+        try:
+            for batch in chain(batches, [None]):
+                if batch:
+                    pending.add(self.pool.submit(index_files, batch, index.reserve(len(batch))))
+                while pending and (batch is None or len(pending) >= limit):
+                    if self.isInterruptionRequested():
+                        return
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index.add(*future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if index.dead > max(1024, len(index.files)):
+            index.compact()
+        if changed or removed or not os.path.exists(index_path):
+            index.save(index_path)
+        if directory == self.root:
+            self.synced_at = time.monotonic()
+        index.ready = True
+        self.directories_found.emit(directories)
+        self.synced.emit(directory, len(changed), len(index.files), time.perf_counter() - started)
+
+
+class FindInFilesPanel(QWidget):
+    location_activated = Signal(str, int, int, int)  # file path, line, column, length
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = None
+        self.search = None
+        self.searches = set()  # running threads, kept until they finish
+        self.root = ""
+        self.started = 0
+        self.indexed = False
+        # Background trigram index of the working directory, kept current
+        # by watching its directories
+        self.index_pool = None
+        self.indexer = None
+        self.indexers = set()
+        self.index_timer = QTimer(self)
+        self.index_timer.setSingleShot(True)
+        self.index_timer.setInterval(SEARCH_INDEX_START_DELAY)
+        self.index_timer.timeout.connect(lambda: self.set_root(QDir.currentPath()))
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        # Directories past SEARCH_INDEX_MAX_WATCHES, checked at query time instead
+        self.unwatched = set()
+
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Search in working directory")
+        self.query_edit.returnPressed.connect(self.start_search)
+        self.case_sensitive_check = QCheckBox("Case Sensitive")
+        self.whole_word_check = QCheckBox("Whole Word")
+        self.regex_check = QCheckBox("Regex")
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self.toggle_search)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderHidden(True)
+        self.results.setUniformRowHeights(True)
+        self.results.itemActivated.connect(self.on_item_activated)
+        self.status_label = QLabel()
+
+        query_layout = QHBoxLayout()
+        query_layout.addWidget(self.query_edit)
+        query_layout.addWidget(self.case_sensitive_check)
+        query_layout.addWidget(self.whole_word_check)
+        query_layout.addWidget(self.regex_check)
+        query_layout.addWidget(self.search_button)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.addLayout(query_layout)
+        layout.addWidget(self.results)
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+    def focus_query(self, text=""):
+        if text:
+            self.query_edit.setText(text)
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+
+    def root_changed(self, root):
+        # Index in the background if this directory was indexed before or
+        # the panel is in use; a new index is otherwise built on first search
+        if self.indexer or os.path.exists(search_index_path(root)):
+            self.index_timer.start()
+
+    def set_root(self, root):
+        if self.indexer and self.indexer.root == root:
+            return
+        self.stop_indexer()
+        if self.index_pool is None:
+            # Half the cores, so searches are not starved while indexing
+            self.index_pool = ProcessPoolExecutor(max(1, (os.cpu_count() or 2) // 2),
+                                                  mp_context=multiprocessing.get_context("spawn"))
+        indexer = TrigramIndexer(self.index_pool, root)
+        indexer.directories_found.connect(lambda directories: self.watch_directories(indexer, directories))
+        indexer.synced.connect(lambda directory, changed, files, seconds:
+                               self.on_index_synced(indexer, directory, changed, files, seconds))
+        indexer.failed.connect(lambda error: self.on_index_failed(indexer, error))
+        indexer.finished.connect(lambda: self.indexers.discard(indexer))
+        self.indexer = indexer
+        self.indexers.add(indexer)
+        indexer.start()
+
+    def stop_indexer(self):
+        if self.indexer:
+            self.indexer.stop()
+            self.indexer = None
+            self.unwatched.clear()
+            if self.watcher.directories():
+                self.watcher.removePaths(self.watcher.directories())
+
+    def watch_directories(self, indexer, directories):
+        if indexer is not self.indexer:
+            return
+        watched = set(self.watcher.directories())
+        room = max(0, SEARCH_INDEX_MAX_WATCHES - len(watched))
+        directories = [directory for directory in directories if directory not in watched]
+        self.unwatched.update(directories[room:])
+        if directories[:room]:
+            self.watcher.addPaths(directories[:room])
+
+    def on_directory_changed(self, directory):
+        if self.indexer:
+            self.indexer.refresh(directory)
+
+    def on_index_synced(self, indexer, directory, changed, files, seconds):
+        if indexer is self.indexer and changed and not self.search:
+            self.status_label.setText(f"Indexed {changed} file(s) in {seconds:.1f} s, {files} file(s) in the index")
+
+    def on_index_failed(self, indexer, error):
+        # Workers that are still alive go with the pool
+        if self.index_pool:
+            self.index_pool.shutdown(wait=False, cancel_futures=True)
+        self.index_pool = None
+        if indexer is self.indexer:
+            self.indexer = None
+            self.status_label.setText(f"Indexing failed: {error}")
+
+    def toggle_search(self):
+        if self.search:
+            self.cancel_search()
+        else:
+            self.start_search()
+
+    def start_search(self):
+        self.cancel_search()
+        text = self.query_edit.text()
+        if not text:
+            return
+        try:
+            # Files are searched as bytes, so case folding covers ASCII only
+            compiled = search_pattern(text, self.case_sensitive_check.isChecked(),
+                                      self.whole_word_check.isChecked(), self.regex_check.isChecked())
+            pattern, flags = compiled.pattern.encode('utf-8'), compiled.flags & ~re.UNICODE
+            re.compile(pattern, flags)
+        except re.error as e:
+            self.status_label.setText(f"Invalid regular expression: {e}")
+            return
+        if self.pool is None:
+            # Worker processes keep the scanning off this process's GIL, so
+            # typing stays responsive; spawn avoids forking a threaded Qt app
+            self.pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+        self.root = QDir.currentPath()
+        self.results.clear()
+        self.started = time.perf_counter()
+        self.set_root(self.root)
+        # Once the index is built only the files holding every trigram of
+        # the query's literal text need to be read, plus the files changed in
+        # directories it has not caught up with yet
+        index = self.indexer.index if self.indexer else None
+        candidates = None
+        stale = ()
+        if index and index.ready:
+            stale = self.indexer.stale_directories() | self.unwatched
+            literals = required_literals(text, self.regex_check.isChecked(), self.case_sensitive_check.isChecked())
+            candidates = index.candidates(trigrams_of(literals))
+            if time.monotonic() - self.indexer.synced_at > SEARCH_INDEX_RESYNC_SECONDS:
+                # Index the edits the directory watches did not report
+                self.indexer.refresh(self.root)
+        self.indexed = candidates is not None
+        search = FileSearchThread(self.pool, self.root, pattern, flags, candidates, index,
+                                  sorted(stale), frozenset(self.watcher.directories()))
+        search.matches_found.connect(lambda results: self.on_matches_found(search, results))
+        search.search_finished.connect(
+            lambda files, matches, stopped: self.on_search_finished(search, files, matches, stopped))
+        search.failed.connect(lambda error: self.on_search_failed(search, error))
+        search.finished.connect(lambda: self.searches.discard(search))
+        self.search = search
+        self.searches.add(search)
+        self.search_button.setText("Stop")
+        self.status_label.setText(f"Searching {self.root}...")
+        search.start()
+
+    def cancel_search(self):
+        if self.search:
+            self.search.requestInterruption()
+            self.search = None
+            self.search_button.setText("Search")
+            self.status_label.setText("Search cancelled")
+
+    def on_matches_found(self, search, results):
+        if search is not self.search:
+            return
+        self.results.setUpdatesEnabled(False)
+        for file_path, matches in results:
+            file_item = QTreeWidgetItem([f"{os.path.relpath(file_path, self.root)} ({len(matches)})"])
+            file_item.setToolTip(0, file_path)
+            file_item.setData(0, Qt.UserRole, (file_path, matches[0][0], matches[0][1], matches[0][2]))
+            for line, column, length, preview in matches:
+                item = QTreeWidgetItem(file_item, [f"{line}: {preview.strip()}"])
+                item.setData(0, Qt.UserRole, (file_path, line, column, length))
+            self.results.addTopLevelItem(file_item)
+            file_item.setExpanded(True)
+        self.results.setUpdatesEnabled(True)
+
+    def on_search_finished(self, search, files, matches, stopped):
+        if search is not self.search:
+            return
+        self.search = None
+        self.search_button.setText("Search")
+        elapsed = (time.perf_counter() - self.started) * 1000
+        limited = f" (stopped at {SEARCH_MAX_MATCHES})" if stopped else ""
+        indexed = " using the index" if self.indexed else ""
+        self.status_label.setText(f"{matches} match(es) in {self.results.topLevelItemCount()} file(s)"
+                                  f"{limited}, {files} file(s) searched{indexed} in {elapsed:.0f} ms")
+
+    def on_search_failed(self, search, error):
+        # A worker died; start a fresh pool next time
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = None
+        if search is self.search:
+            self.search = None
+            self.search_button.setText("Search")
+            self.status_label.setText(f"Search failed: {error}")
+
+    def on_item_activated(self, item):
+        location = item.data(0, Qt.UserRole)
+        if location:
+            self.location_activated.emit(*location)
+
+    def shutdown(self):
+        self.cancel_search()
+        self.index_timer.stop()
+        self.stop_indexer()
+        for thread in list(self.searches) + list(self.indexers):
+            thread.wait()
+        for pool in (self.pool, self.index_pool):
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = self.index_pool = None
+
 
 # ---------- Line Number Area ----------
 class LineNumberArea(QWidget):
@@ -154,9 +2104,102 @@ class LineNumberArea(QWidget):
     def paintEvent(self, event):
         self.code_editor.lineNumberAreaPaintEvent(event)
 
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            block = self.code_editor.cursorForPosition(QPoint(0, event.pos().y())).block()
+            messages = self.code_editor.diagnostic_messages(lambda cursor: cursor.block() == block)
+            if messages:
+                QToolTip.showText(event.globalPos(), messages, self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
 
 # ---------- Enhanced Code Editor Widget ----------
+# Bytes per block for layout, user data and highlight formats
+BLOCK_MEMORY_ESTIMATE = 160
+SEARCH_HIGHLIGHT_COLOR = "#613214"
+# Live search highlights at most this many matches in the viewport
+LIVE_SEARCH_MAX_SELECTIONS = 1000
+LIVE_SEARCH_COUNT_DELAY = 300
+# Characters copied per step when snapshotting the text for counting
+SEARCH_SNAPSHOT_CHUNK = 64 * 1024
+SEARCH_SNAPSHOT_SLICE_SECONDS = 0.008
+
+
+class MatchCountThread(QThread):
+    counted = Signal(int)
+
+    def __init__(self, parts, pattern):
+        super().__init__()
+        self.parts = parts
+        self.pattern = pattern
+
+    def run(self):
+        # Joined here rather than on the GUI thread
+        source = self.parts[0] if len(self.parts) == 1 else "".join(self.parts)
+        count = 0
+        for match in self.pattern.finditer(source):
+            if match.end() > match.start():
+                count += 1
+                if not count % 1024 and self.isInterruptionRequested():
+                    return
+        if not self.isInterruptionRequested():
+            self.counted.emit(count)
+
+
+# Background syntax check: runs after this much typing pause, and starts
+# at most once per interval
+SYNTAX_CHECK_DELAY = 700
+SYNTAX_CHECK_MIN_INTERVAL = 2.0
+SYNTAX_CHECK_MAX_CHARS = 1024 * 1024
+SYNTAX_CHECK_MAX_DIAGNOSTICS = 100
+SYNTAX_CHECK_SUFFIXES = PROJECT_SOURCE_SUFFIXES | frozenset([".h", ".hh", ".hpp", ".hxx"])
+DIAGNOSTIC_COLORS = {"error": "#f14c4c", "warning": "#cca700"}
+_DIAGNOSTIC_RE = re.compile(r"<stdin>:(\d+):(?:(\d+):)? (fatal error|error|warning): (.*)")
+
+
+class SyntaxCheckThread(QThread):
+    checked = Signal(list)  # (line, column, severity, message), counted from 1
+
+    def __init__(self, compiler, flags, directory, text, version):
+        super().__init__()
+        self.compiler = compiler
+        self.flags = flags
+        self.directory = directory
+        self.text = text
+        self.version = version
+        self.processes = BuildProcesses()
+
+    def run(self):
+        # The buffer goes in on stdin; quoted includes still resolve next to the file
+        result = self.processes.run(
+            f'{self.compiler} -fsyntax-only -x c++ -iquote "{self.directory}" {self.flags} -',
+            shell=True, capture_output=True, input=self.text.encode("utf-8", "replace"),
+            cwd=self.directory if os.path.isdir(self.directory) else None)
+        if self.isInterruptionRequested():
+            return
+        diagnostics = []
+        for line in result.stderr.decode("utf-8", "replace").splitlines():
+            match = _DIAGNOSTIC_RE.match(line)
+            # A header checked on its own is its own main file
+            if match and "#pragma once in main file" not in match.group(4):
+                severity = "warning" if match.group(3) == "warning" else "error"
+                diagnostics.append((int(match.group(1)), int(match.group(2) or 1), severity, match.group(4)))
+                if len(diagnostics) >= SYNTAX_CHECK_MAX_DIAGNOSTICS:
+                    break
+        self.checked.emit(diagnostics)
+
+    def cancel(self):
+        self.requestInterruption()
+        self.processes.cancel()
+
+
 class CodeEditor(QPlainTextEdit):
+    modification_changed = Signal(bool)
+    matches_counted = Signal(int)
+
     def __init__(self):
         super().__init__()
         self.setFont(QFont("Consolas", 12))
@@ -166,31 +2209,367 @@ class CodeEditor(QPlainTextEdit):
         # Editor settings
         self.auto_indent_enabled = True
         self.tab_size = 4
+        self.highlighter = None
+        # Line number of the first block, for views showing part of a file
+        self.first_line_number = 0
+        self.encoding = "utf-8"
+        self.loader = None
+        # (cursor position, scroll value) to restore once loading finishes
+        self.restore_position = None
+        # (line, column, length) to go to once loading finishes
+        self.pending_goto = None
+
+        # Live search: matches in the viewport are highlighted as extra
+        # selections, the total is counted on a background thread
+        self.live_pattern = None
+        self.search_selections = []
+        self._search_view = None
+        # The text for counting is copied in slices between events, and
+        # kept until the next edit; text_version ignores format changes
+        self.text_version = 0
+        self._search_text = (None, [])
+        self._search_snapshot = None
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.setSingleShot(True)
+        self.snapshot_timer.timeout.connect(self.snapshot_search_text)
+        self.match_counter = None
+        self.match_counters = set()  # running threads, kept until they finish
+        self.match_count_timer = QTimer(self)
+        self.match_count_timer.setSingleShot(True)
+        self.match_count_timer.setInterval(LIVE_SEARCH_COUNT_DELAY)
+        self.match_count_timer.timeout.connect(self.count_matches)
+
+        # Syntax check: a snapshot of the text is compiled with -fsyntax-only
+        # after a pause in typing; the window sets syntax_check_args to a
+        # callable giving (compiler, flags, directory), or None to skip the check
+        self.syntax_check_args = None
+        self.diagnostics = []  # (cursor over the span, severity, message)
+        self.diagnostic_selections = []
+        self.syntax_checker = None
+        self.syntax_checkers = set()  # running threads, kept until they finish
+        self._syntax_checked = None
+        self.last_syntax_check = 0.0
+        self.syntax_check_timer = QTimer(self)
+        self.syntax_check_timer.setSingleShot(True)
+        self.syntax_check_timer.timeout.connect(self.check_syntax)
         
         # Line number area
         self.line_number_area = LineNumberArea(self)
         self.blockCountChanged.connect(self.updateLineNumberAreaWidth)
         self.updateRequest.connect(self.updateLineNumberArea)
+        self.updateRequest.connect(self.update_search_selections)
         self.cursorPositionChanged.connect(self.highlightCurrentLine)
         
-        # Auto-save timer
-        self.auto_save_timer = QTimer()
-        self.auto_save_timer.timeout.connect(self.auto_save)
-        self.auto_save_timer.start(30000)  # Auto-save every 30 seconds
-        
         self.updateLineNumberAreaWidth(0)
         self.highlightCurrentLine()
         
-        # Track modifications
+        # Track modifications against the text as last loaded or saved:
+        # (document revision, character count, crc32). Edits that put the
+        # text back the way it was leave the document clean.
+        self.clean_state = None
+        self._modified_check = (None, True)
+        self.was_modified = False
         self.is_modified = False
+        self.modification_timer = QTimer(self)
+        self.modification_timer.setSingleShot(True)
+        self.modification_timer.setInterval(300)
+        self.modification_timer.timeout.connect(self.check_modified)
         self.textChanged.connect(self.on_text_changed)
+        self.document().contentsChange.connect(self.on_contents_change)
+
+    @property
+    def is_modified(self):
+        if self.clean_state is None:
+            return True
+        document = self.document()
+        revision, length, crc = self.clean_state
+        if document.revision() == revision:
+            return False
+        if document.characterCount() != length:
+            return True
+        # Same length: only now is the text itself worth hashing
+        checked_revision, modified = self._modified_check
+        if checked_revision != document.revision():
+            modified = self.text_crc() != crc
+            self._modified_check = (document.revision(), modified)
+        return modified
+
+    @is_modified.setter
+    def is_modified(self, modified):
+        document = self.document()
+        self.mark_clean(None if modified else (
+            document.revision(), document.characterCount(), self.text_crc()))
+
+    def mark_clean(self, clean_state):
+        # Count the document as clean wherever its text matches clean_state
+        self.clean_state = clean_state
+        self._modified_check = (None, True)
+        self.check_modified()
+
+    def text_crc(self):
+        return zlib.crc32(self.toPlainText().encode("utf-8", "surrogatepass"))
+
+    def check_modified(self):
+        modified = self.is_modified
+        if modified != self.was_modified:
+            self.was_modified = modified
+            self.modification_changed.emit(modified)
 
     def on_text_changed(self):
-        self.is_modified = True
+        if not self.loader:
+            self.modification_timer.start()
+
+    def on_contents_change(self, position, removed, added):
+        # Highlighting reports changes with nothing removed or added
+        if removed or added:
+            self.text_version += 1
+            if self.live_pattern and not self.loader:
+                self.match_count_timer.start()
+            if self.syntax_check_args and not self.loader:
+                self.schedule_syntax_check()
+
+    def set_live_pattern(self, pattern):
+        self.live_pattern = pattern
+        self._search_view = None
+        self.update_search_selections()
+        self.count_matches()
+
+    def update_search_selections(self, *_):
+        # Only the visible blocks are searched, again whenever the view
+        # scrolls, resizes or the text changes
+        if not self.live_pattern:
+            if self.search_selections:
+                self.search_selections = []
+                self.highlightCurrentLine()
+            return
+        block = self.firstVisibleBlock()
+        view = (block.blockNumber(), self.first_line_number, self.text_version,
+                self.viewport().height(), self.live_pattern)
+        if view == self._search_view:
+            return
+        self._search_view = view
+        selections = []
+        offset = self.contentOffset()
+        bottom = self.viewport().height()
+        while block.isValid() and self.blockBoundingGeometry(block).translated(offset).top() <= bottom:
+            text = block.text()
+            astral = astral_positions(text)
+            for match in self.live_pattern.finditer(text):
+                start, end = match.span()
+                if start == end:
+                    continue
+                selection = QTextEdit.ExtraSelection()
+                selection.format.setBackground(QColor(SEARCH_HIGHLIGHT_COLOR))
+                selection.cursor = QTextCursor(block)
+                selection.cursor.setPosition(block.position() + start + bisect_left(astral, start))
+                selection.cursor.setPosition(block.position() + end + bisect_left(astral, end),
+                                             QTextCursor.KeepAnchor)
+                selections.append(selection)
+                if len(selections) >= LIVE_SEARCH_MAX_SELECTIONS:
+                    break
+            if len(selections) >= LIVE_SEARCH_MAX_SELECTIONS:
+                break
+            block = block.next()
+        self.search_selections = selections
+        self.highlightCurrentLine()
 
-    def auto_save(self):
-        if hasattr(self.parent(), 'auto_save_current_file'):
-            self.parent().auto_save_current_file()
+    def search_source(self):
+        # (text parts, pattern) to count over, or None until the snapshot is ready
+        if self._search_text[0] != self.text_version:
+            return None
+        return self._search_text[1], self.live_pattern
+
+    def snapshot_search_text(self):
+        # Copy the text a chunk of blocks at a time, so a large document
+        # never stalls typing; an edit midway starts the copy over
+        if not self._search_snapshot or self._search_snapshot[0] != self.text_version:
+            self._search_snapshot = (self.text_version, [], 0)
+        version, parts, position = self._search_snapshot
+        document = self.document()
+        end_of_text = document.characterCount() - 1
+        cursor = QTextCursor(document)
+        deadline = time.perf_counter() + SEARCH_SNAPSHOT_SLICE_SECONDS
+        while position < end_of_text and time.perf_counter() < deadline:
+            end = position + SEARCH_SNAPSHOT_CHUNK
+            if end >= end_of_text:
+                end = end_of_text
+            else:
+                # End on a block boundary, or the end of one very long block
+                block = document.findBlock(end)
+                end = block.position() if block.position() > position else block.position() + block.length() - 1
+            cursor.setPosition(position)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            parts.append(cursor.selectedText().replace("\u2029", "\n"))
+            position = end
+        if position < end_of_text:
+            self._search_snapshot = (version, parts, position)
+            self.snapshot_timer.start()
+            return
+        self._search_snapshot = None
+        self._search_text = (version, parts)
+        self.count_matches()
+
+    def count_matches(self):
+        self.stop_counting()
+        if not self.live_pattern or self.loader:
+            return
+        try:
+            source = self.search_source()
+        except re.error:
+            return
+        if source is None:
+            self.snapshot_search_text()
+            return
+        counter = MatchCountThread(*source)
+        counter.counted.connect(lambda count: self.on_matches_counted(counter, count))
+        counter.finished.connect(lambda: self.match_counters.discard(counter))
+        self.match_counter = counter
+        self.match_counters.add(counter)
+        counter.start()
+
+    def on_matches_counted(self, counter, count):
+        if counter is self.match_counter:
+            self.match_counter = None
+            self.matches_counted.emit(count)
+
+    def stop_counting(self):
+        self.match_count_timer.stop()
+        self.snapshot_timer.stop()
+        if self.match_counter:
+            self.match_counter.requestInterruption()
+            self.match_counter = None
+
+    def schedule_syntax_check(self):
+        # The running check is for text that is about to change
+        self.stop_syntax_check()
+        self.syntax_check_timer.start(SYNTAX_CHECK_DELAY)
+
+    def check_syntax(self):
+        args = self.syntax_check_args() if self.syntax_check_args and not self.loader else None
+        if args is None:
+            if self.diagnostics:
+                self.diagnostics = []
+                self.update_diagnostic_selections()
+            return
+        if self._syntax_checked == (self.text_version, args) or self.syntax_checker:
+            return
+        wait = self.last_syntax_check + SYNTAX_CHECK_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            self.syntax_check_timer.start(int(wait * 1000) + 1)
+            return
+        if self.document().characterCount() > SYNTAX_CHECK_MAX_CHARS:
+            return
+        self.last_syntax_check = time.monotonic()
+        self._syntax_checked = (self.text_version, args)
+        checker = SyntaxCheckThread(*args, self.toPlainText(), self.text_version)
+        checker.checked.connect(lambda diagnostics: self.on_syntax_checked(checker, diagnostics))
+        checker.finished.connect(lambda: self.syntax_checkers.discard(checker))
+        self.syntax_checker = checker
+        self.syntax_checkers.add(checker)
+        checker.start()
+
+    def on_syntax_checked(self, checker, diagnostics):
+        if checker is not self.syntax_checker:
+            return
+        self.syntax_checker = None
+        if checker.version != self.text_version:
+            return
+        document = self.document()
+        self.diagnostics = []
+        for line, column, severity, message in diagnostics:
+            block = document.findBlockByNumber(line - 1)
+            if not block.isValid():
+                continue
+            # Compilers count columns in bytes, Qt positions in UTF-16 units
+            text = block.text()
+            start = len(text.encode("utf-8")[:column - 1].decode("utf-8", "ignore"))
+            word = re.match(r"\w+|\S", text[start:])
+            if word:
+                end = start + len(word.group())
+            else:
+                # Past the last token: mark the character before
+                start, end = max(0, start - 1), start
+            cursor = QTextCursor(block)
+            cursor.setPosition(block.position() + len(text[:start].encode("utf-16-le")) // 2)
+            cursor.setPosition(block.position() + len(text[:end].encode("utf-16-le")) // 2,
+                               QTextCursor.KeepAnchor)
+            self.diagnostics.append((cursor, severity, message))
+        self.update_diagnostic_selections()
+
+    def update_diagnostic_selections(self):
+        selections = []
+        for cursor, severity, _ in self.diagnostics:
+            selection = QTextEdit.ExtraSelection()
+            selection.format.setUnderlineStyle(QTextCharFormat.WaveUnderline)
+            selection.format.setUnderlineColor(QColor(DIAGNOSTIC_COLORS[severity]))
+            selection.cursor = cursor
+            selections.append(selection)
+        self.diagnostic_selections = selections
+        self.highlightCurrentLine()
+        self.line_number_area.update()
+
+    def diagnostic_messages(self, matches):
+        # The messages of the diagnostics whose span cursor satisfies matches, one per line
+        return "\n".join(f"{severity}: {message}" for cursor, severity, message in self.diagnostics
+                         if matches(cursor))
+
+    def stop_syntax_check(self):
+        self.syntax_check_timer.stop()
+        if self.syntax_checker:
+            self.syntax_checker.cancel()
+            self.syntax_checker = None
+            self._syntax_checked = None
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip and self.diagnostics:
+            position = self.cursorForPosition(event.pos()).position()
+            messages = self.diagnostic_messages(
+                lambda cursor: cursor.selectionStart() <= position <= cursor.selectionEnd())
+            if messages:
+                QToolTip.showText(event.globalPos(), messages, self.viewport())
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
+
+    def line_count(self):
+        return self.blockCount()
+
+    def goto_line(self, line, column=0, length=0):
+        block = self.document().findBlockByNumber(line - 1)
+        if block.isValid():
+            cursor = QTextCursor(block)
+            cursor.setPosition(block.position() + min(column, block.length() - 1))
+            if length:
+                cursor.setPosition(min(cursor.position() + length, block.position() + block.length() - 1),
+                                   QTextCursor.KeepAnchor)
+            self.setTextCursor(cursor)
+            self.centerCursor()
+
+    def release(self):
+        # Stop background work before the tab goes away
+        if self.loader:
+            self.loader.cancel()
+        if self.highlighter:
+            self.highlighter.stop_background_lexing()
+        self.stop_counting()
+        for counter in list(self.match_counters):
+            counter.requestInterruption()
+            counter.wait()
+        self.stop_syntax_check()
+        for checker in list(self.syntax_checkers):
+            checker.cancel()
+            checker.wait()
+
+    def memory_usage(self):
+        # Rough estimate: UTF-16 text plus layout and format data per block
+        document = self.document()
+        return document.characterCount() * 2 + document.blockCount() * BLOCK_MEMORY_ESTIMATE
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.highlighter:
+            self.highlighter.resume()
 
     def keyPressEvent(self, event):
         # Auto-indent on Enter
@@ -289,6 +2668,14 @@ class CodeEditor(QPlainTextEdit):
 
         painter.fillRect(event.rect(), QColor("#2d2d2d"))
 
+        # One marker per line with diagnostics, errors over warnings
+        markers = {}
+        for cursor, severity, _ in self.diagnostics:
+            number = cursor.block().blockNumber()
+            if markers.get(number) != "error":
+                markers[number] = severity
+        marker_size = 7  # fits the padding left of the numbers
+
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
@@ -296,7 +2683,7 @@ class CodeEditor(QPlainTextEdit):
 
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
+                number = str(block_number + 1 + self.first_line_number)
                 painter.setPen(QColor("#888"))
                 painter.drawText(
                     0, int(top),
@@ -305,6 +2692,12 @@ class CodeEditor(QPlainTextEdit):
                     Qt.AlignRight,
                     number
                 )
+                severity = markers.get(block_number)
+                if severity:
+                    painter.setPen(Qt.NoPen)
+                    painter.setBrush(QColor(DIAGNOSTIC_COLORS[severity]))
+                    painter.drawEllipse(2, int(top) + (self.fontMetrics().height() - marker_size) // 2,
+                                        marker_size, marker_size)
 
             block = block.next()
             top = bottom
@@ -319,7 +2712,10 @@ class CodeEditor(QPlainTextEdit):
         )
             
     def updateLineNumberAreaWidth(self, _):
-        self.setViewportMargins(self.lineNumberAreaWidth(), 0, 0, 0)
+        # Called for every repaint request; only relayout when the width changes
+        width = self.lineNumberAreaWidth()
+        if self.viewportMargins().left() != width:
+            self.setViewportMargins(width, 0, 0, 0)
 
     def updateLineNumberArea(self, rect, dy):
         if dy:
@@ -339,142 +2735,897 @@ class CodeEditor(QPlainTextEdit):
             selection.cursor = self.textCursor()
             selection.cursor.clearSelection()
             extra_selections.append(selection)
-        self.setExtraSelections(extra_selections)
+        self.setExtraSelections(extra_selections + self.diagnostic_selections + self.search_selections)
+
+
+# ---------- Large File Viewer ----------
+class LineIndexThread(QThread):
+    lines_indexed = Signal(object, int)  # line start offsets, bytes scanned
+
+    def __init__(self, mapped):
+        super().__init__()
+        self.mapped = mapped
+
+    def run(self):
+        size = len(self.mapped)
+        position = 0
+        while position < size:
+            if self.isInterruptionRequested():
+                return
+            chunk = self.mapped[position:position + 4 * 1024 * 1024]
+            # Every newline starts a line; lengths are summed in C, not per byte
+            lengths = map((1).__add__, map(len, chunk.split(b"\n")[:-1]))
+            offsets = array("q", accumulate(lengths, initial=position))
+            position += len(chunk)
+            self.lines_indexed.emit(offsets[1:], position)
+
+
+class LargeFileEditor(CodeEditor):
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.setReadOnly(True)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
+        # The file stays on disk; only the visible lines are decoded
+        self._file = open(file_path, 'rb')
+        self.mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.line_offsets = array("q", [0])
+        self.indexed_bytes = 0
+        self.top_line = 0
+
+        self.line_scrollbar = QScrollBar(Qt.Vertical, self)
+        self.line_scrollbar.valueChanged.connect(self.show_lines)
+
+        self.indexer = LineIndexThread(self.mapped)
+        self.indexer.lines_indexed.connect(self.on_lines_indexed)
+        self.indexer.start()
+        self.updateLineNumberAreaWidth(0)
+        self.show_lines(0)
+
+    def on_text_changed(self):
+        pass
+
+    @property
+    def is_modified(self):
+        # The document only ever holds a window of the file
+        return False
+
+    @is_modified.setter
+    def is_modified(self, modified):
+        pass
+
+    def setLineWrapMode(self, mode):
+        # Wrapping would break the one block per file line mapping
+        super().setLineWrapMode(QPlainTextEdit.NoWrap)
+
+    def release(self):
+        super().release()
+        self.indexer.requestInterruption()
+        self.indexer.wait()
+        self.mapped.close()
+        self._file.close()
+
+    def is_indexed(self):
+        return self.indexed_bytes >= len(self.mapped)
+
+    def search_source(self):
+        # Count over the whole mapped file, as bytes
+        pattern = self.live_pattern
+        return [self.mapped], re.compile(pattern.pattern.encode('utf-8'), pattern.flags & ~re.UNICODE)
+
+    def line_count(self):
+        return len(self.line_offsets)
+
+    def visible_line_count(self):
+        return max(1, self.viewport().height() // max(1, self.fontMetrics().height()))
+
+    def on_lines_indexed(self, offsets, scanned):
+        self.line_offsets.extend(offsets)
+        self.indexed_bytes = scanned
+        self.line_scrollbar.setRange(0, max(0, self.line_count() - self.visible_line_count()))
+        self.line_scrollbar.setPageStep(self.visible_line_count())
+        if self.top_line + self.visible_line_count() >= self.line_count() - len(offsets):
+            self.show_lines(self.top_line)
+        self.updateLineNumberAreaWidth(0)
+
+    def line_start(self, line):
+        if line < len(self.line_offsets):
+            return self.line_offsets[line]
+        return self.indexed_bytes
+
+    def show_lines(self, top):
+        self.top_line = max(0, min(top, self.line_count() - 1))
+        start = self.line_start(self.top_line)
+        end = self.line_start(self.top_line + self.visible_line_count() + 1)
+        # Cap the window so a single huge line cannot stall the UI
+        end = min(end, start + 1024 * 1024)
+        text = self.mapped[start:end].decode('utf-8', errors='replace')
+        self.first_line_number = self.top_line
+        self.setPlainText(text.replace('\r\n', '\n').removesuffix('\n'))
+        if self.line_scrollbar.value() != self.top_line:
+            self.line_scrollbar.setValue(self.top_line)
+        self.line_number_area.update()
+
+    def goto_line(self, line, column=0, length=0):
+        line = max(0, min(line - 1, self.line_count() - 1))
+        self.show_lines(line - self.visible_line_count() // 3)
+        block = self.document().findBlockByNumber(line - self.top_line)
+        cursor = QTextCursor(block)
+        cursor.setPosition(block.position() + min(column, block.length() - 1))
+        if length:
+            cursor.setPosition(min(cursor.position() + length, block.position() + block.length() - 1),
+                               QTextCursor.KeepAnchor)
+        self.setTextCursor(cursor)
+
+    def find(self, text, flags=QTextDocument.FindFlag(0), regex=False):
+        pattern = text.encode('utf-8') if regex else re.escape(text.encode('utf-8'))
+        if flags & QTextDocument.FindWholeWords:
+            pattern = rb"\b" + pattern + rb"\b"
+        regex = re.compile(pattern, 0 if flags & QTextDocument.FindCaseSensitively else re.IGNORECASE)
+
+        # Search from the end of the selection, wrapping to the start of the file
+        cursor = self.textCursor()
+        line = self.top_line + cursor.block().blockNumber()
+        column = cursor.position() - cursor.block().position()
+        position = self.line_start(line) + len(cursor.block().text()[:column].encode('utf-8'))
+        limit = self.indexed_bytes
+        match = regex.search(self.mapped, position, limit) or regex.search(self.mapped, 0, limit)
+        if not match:
+            return False
+
+        line = bisect_right(self.line_offsets, match.start()) - 1
+        prefix = self.mapped[self.line_offsets[line]:match.start()].decode('utf-8', errors='replace')
+        length = len(match.group().decode('utf-8', errors='replace'))
+        self.goto_line(line + 1, len(prefix), length)
+        return True
+
+    def lineNumberAreaWidth(self):
+        if not hasattr(self, 'line_offsets'):
+            return super().lineNumberAreaWidth()
+        digits = len(str(self.line_count()))
+        return 10 + self.fontMetrics().horizontalAdvance('9') * digits
+
+    def updateLineNumberAreaWidth(self, _):
+        # Leave room on the right for the file-wide scroll bar
+        if not hasattr(self, 'line_scrollbar'):
+            return super().updateLineNumberAreaWidth(_)
+        margins = self.viewportMargins()
+        width = self.lineNumberAreaWidth()
+        scrollbar_width = self.line_scrollbar.sizeHint().width()
+        if margins.left() != width or margins.right() != scrollbar_width:
+            self.setViewportMargins(width, 0, scrollbar_width, 0)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        cr = self.contentsRect()
+        width = self.line_scrollbar.sizeHint().width()
+        self.line_scrollbar.setGeometry(QRect(cr.right() - width + 1, cr.top(), width, cr.height()))
+        self.line_scrollbar.setPageStep(self.visible_line_count())
+        self.line_scrollbar.setRange(0, max(0, self.line_count() - self.visible_line_count()))
+        self.show_lines(self.top_line)
+
+    def wheelEvent(self, event):
+        lines = event.angleDelta().y() // 40
+        if lines and not event.modifiers() & Qt.ControlModifier:
+            self.line_scrollbar.setValue(self.line_scrollbar.value() - lines)
+        else:
+            super().wheelEvent(event)
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        block = self.textCursor().blockNumber()
+        page = self.visible_line_count()
+        if key == Qt.Key_Up and block == 0:
+            self.line_scrollbar.setValue(self.top_line - 1)
+        elif key == Qt.Key_Down and block >= page - 1:
+            self.line_scrollbar.setValue(self.top_line + 1)
+        elif key == Qt.Key_PageUp:
+            self.line_scrollbar.setValue(self.top_line - page)
+        elif key == Qt.Key_PageDown:
+            self.line_scrollbar.setValue(self.top_line + page)
+        elif key == Qt.Key_Home and event.modifiers() & Qt.ControlModifier:
+            self.line_scrollbar.setValue(0)
+        elif key == Qt.Key_End and event.modifiers() & Qt.ControlModifier:
+            self.line_scrollbar.setValue(self.line_scrollbar.maximum())
+        else:
+            # Skip CodeEditor's indenting keys, the view is read-only
+            QPlainTextEdit.keyPressEvent(self, event)
+
+
+# ---------- Session Placeholder ----------
+class PlaceholderTab(QWidget):
+    # Stands in for a restored or hibernated tab until it is activated,
+    # keeping only what is needed to open the file where it was left
+    def __init__(self, file_path, cursor_position=0, scroll_value=0):
+        super().__init__()
+        self.file_path = file_path
+        self.cursor_position = cursor_position
+        self.scroll_value = scroll_value
+        self.is_modified = False
+        self.loader = None
+        self.highlighter = None
+        # Hibernated tabs keep their text compressed instead of rereading the file
+        self.compressed = None
+        self.encoding = "utf-8"
+        self.clean_state = None
+
+    @classmethod
+    def hibernate(cls, editor, file_path):
+        placeholder = cls(file_path, editor.textCursor().position(), editor.verticalScrollBar().value())
+        text = editor.toPlainText().encode("utf-8", "surrogatepass")
+        placeholder.compressed = zlib.compress(text, 1)
+        placeholder.is_modified = editor.is_modified
+        placeholder.clean_state = editor.clean_state
+        placeholder.encoding = editor.encoding
+        return placeholder
+
+    def text(self):
+        return zlib.decompress(self.compressed).decode("utf-8", "surrogatepass")
+
+    def memory_usage(self):
+        return len(self.compressed or b"")
+
+    def release(self):
+        pass
+
+
+# ---------- C++ Lexer ----------
+# Token kinds produced by tokenize_cpp, used as keys into the highlight formats
+TOKEN_KEYWORD = 0
+TOKEN_PREPROCESSOR = 1
+TOKEN_STRING = 2
+TOKEN_NUMBER = 3
+TOKEN_COMMENT = 4
+TOKEN_FUNCTION = 5
+
+# Block states stored with setCurrentBlockState. The low three bits hold the
+# construct that is still open at the end of the line, STATE_DIRECTIVE marks a
+# preprocessor directive continued with a backslash, and raw string literals
+# keep the id of their delimiter above STATE_DELIMITER_SHIFT.
+STATE_NORMAL = 0
+STATE_BLOCK_COMMENT = 1
+STATE_LINE_COMMENT = 2
+STATE_STRING = 3
+STATE_RAW_STRING = 4
+STATE_KIND_MASK = 0x7
+STATE_DIRECTIVE = 0x8
+STATE_DELIMITER_SHIFT = 4
+
+CPP_KEYWORDS = frozenset([
+    "alignas", "alignof", "and", "and_eq", "asm", "auto", "bitand", "bitor",
+    "bool", "break", "case", "catch", "char", "char8_t", "char16_t", "char32_t",
+    "class", "compl", "concept", "const", "consteval", "constexpr", "constinit",
+    "const_cast", "continue", "co_await", "co_return", "co_yield", "decltype",
+    "default", "delete", "do", "double", "dynamic_cast", "else", "enum",
+    "explicit", "export", "extern", "false", "float", "for", "friend", "goto",
+    "if", "inline", "int", "long", "mutable", "namespace", "new", "noexcept",
+    "not", "not_eq", "nullptr", "operator", "or", "or_eq", "private", "protected",
+    "public", "register", "reinterpret_cast", "requires", "return", "short",
+    "signed", "sizeof", "static", "static_assert", "static_cast", "struct",
+    "switch", "template", "this", "thread_local", "throw", "true", "try",
+    "typedef", "typeid", "typename", "union", "unsigned", "using", "virtual",
+    "void", "volatile", "wchar_t", "while", "xor", "xor_eq"
+])
+
+# One alternation scanned left to right; identifiers followed by "(" are calls
+_TOKEN_RE = re.compile(r"""
+      (?P<comment>//.*)
+    | (?P<block_comment>/\*)
+    | (?P<raw_string>(?:u8|[uUL])?R"(?P<delimiter>[^()\\\s"]{0,16})\()
+    | (?P<string>"(?:[^"\\]|\\.)*(?P<closed>")?)
+    | (?P<char>'(?:[^'\\]|\\.)*')
+    | (?P<number>\.?\d(?:[eEpP][+-]|[\w.]|'(?=\w))*)
+    | (?P<identifier>[A-Za-z_]\w*)(?P<call>\s*\()?
+""", re.VERBOSE)
+_DIRECTIVE_RE = re.compile(r"\s*(#\s*(\w*))")
+_HEADER_NAME_RE = re.compile(r"\s*(<[^>]*>)")
+_STRING_REST_RE = re.compile(r'(?:[^"\\]|\\.)*(")?')
+_INCLUDE_DIRECTIVES = frozenset(["include", "include_next", "import"])
+_ASTRAL_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+# Raw string delimiters are interned so they fit in an integer block state
+_raw_delimiters = {"": 0}
+_raw_delimiter_names = [""]
+_raw_delimiter_lock = threading.Lock()
+
+
+def _raw_delimiter_id(delimiter):
+    delimiter_id = _raw_delimiters.get(delimiter)
+    if delimiter_id is None:
+        with _raw_delimiter_lock:
+            delimiter_id = _raw_delimiters.get(delimiter)
+            if delimiter_id is None:
+                delimiter_id = len(_raw_delimiter_names)
+                _raw_delimiter_names.append(delimiter)
+                _raw_delimiters[delimiter] = delimiter_id
+    return delimiter_id
+
+
+def _to_utf16(text, tokens):
+    # Qt positions count UTF-16 code units, Python counts code points
+    if text.isascii() or not _ASTRAL_RE.search(text):
+        return tokens
+    offsets = [0]
+    for ch in text:
+        offsets.append(offsets[-1] + (2 if ord(ch) > 0xFFFF else 1))
+    return [(offsets[start], offsets[start + length] - offsets[start], kind)
+            for start, length, kind in tokens]
+
+
+def _continues(text):
+    # Backslash-newline splices the next line onto this one
+    return text.rstrip().endswith("\\")
+
+
+def tokenize_cpp(text, state=STATE_NORMAL):
+    tokens = []
+    append = tokens.append
+    pos = 0
+    end = len(text)
+    directive = state & STATE_DIRECTIVE
+    kind = state & STATE_KIND_MASK
+
+    # Finish whatever construct the previous line left open
+    if kind == STATE_BLOCK_COMMENT:
+        close = text.find("*/")
+        if close == -1:
+            if end:
+                append((0, end, TOKEN_COMMENT))
+            return _to_utf16(text, tokens), state
+        pos = close + 2
+        append((0, pos, TOKEN_COMMENT))
+    elif kind == STATE_LINE_COMMENT:
+        if end:
+            append((0, end, TOKEN_COMMENT))
+        if _continues(text):
+            return _to_utf16(text, tokens), state
+        return _to_utf16(text, tokens), STATE_NORMAL
+    elif kind == STATE_STRING:
+        match = _STRING_REST_RE.match(text)
+        if match.group(1) is None:
+            if end:
+                append((0, end, TOKEN_STRING))
+            # The match stops short of the line end only at a lone trailing "\"
+            next_state = state if match.end() < end else STATE_NORMAL
+            return _to_utf16(text, tokens), next_state
+        pos = match.end()
+        append((0, pos, TOKEN_STRING))
+    elif kind == STATE_RAW_STRING:
+        delimiter = _raw_delimiter_names[state >> STATE_DELIMITER_SHIFT]
+        close = text.find(")" + delimiter + '"')
+        if close == -1:
+            if end:
+                append((0, end, TOKEN_STRING))
+            return _to_utf16(text, tokens), state
+        pos = close + len(delimiter) + 2
+        append((0, pos, TOKEN_STRING))
+    elif not directive:
+        # A directive is only recognised as the first token of a logical line
+        match = _DIRECTIVE_RE.match(text)
+        if match:
+            directive = STATE_DIRECTIVE
+            pos = match.end()
+            append((match.start(1), pos - match.start(1), TOKEN_PREPROCESSOR))
+            if match.group(2) in _INCLUDE_DIRECTIVES:
+                header = _HEADER_NAME_RE.match(text, pos)
+                if header:
+                    pos = header.end()
+                    append((header.start(1), pos - header.start(1), TOKEN_STRING))
+
+    search = _TOKEN_RE.search
+    while pos < end:
+        match = search(text, pos)
+        if match is None:
+            break
+        group = match.lastgroup
+        start = match.start()
+        pos = match.end()
+
+        if group == "call":
+            append((start, match.end("identifier") - start, TOKEN_FUNCTION))
+        elif group == "identifier":
+            if match.group() in CPP_KEYWORDS:
+                append((start, pos - start, TOKEN_KEYWORD))
+        elif group == "number":
+            append((start, pos - start, TOKEN_NUMBER))
+        elif group == "char":
+            append((start, pos - start, TOKEN_STRING))
+        elif group == "string":
+            if match.group("closed") is None:
+                # Unterminated: runs to the end of the line, or past it with "\"
+                append((start, end - start, TOKEN_STRING))
+                next_state = STATE_STRING | directive if pos < end else STATE_NORMAL
+                return _to_utf16(text, tokens), next_state
+            append((start, pos - start, TOKEN_STRING))
+        elif group == "comment":
+            append((start, pos - start, TOKEN_COMMENT))
+            if _continues(text):
+                return _to_utf16(text, tokens), STATE_LINE_COMMENT | directive
+            return _to_utf16(text, tokens), STATE_NORMAL
+        elif group == "block_comment":
+            close = text.find("*/", pos)
+            if close == -1:
+                append((start, end - start, TOKEN_COMMENT))
+                return _to_utf16(text, tokens), STATE_BLOCK_COMMENT | directive
+            pos = close + 2
+            append((start, pos - start, TOKEN_COMMENT))
+        else:
+            delimiter = match.group("delimiter")
+            close = text.find(")" + delimiter + '"', pos)
+            if close == -1:
+                append((start, end - start, TOKEN_STRING))
+                delimiter_id = _raw_delimiter_id(delimiter)
+                next_state = STATE_RAW_STRING | (delimiter_id << STATE_DELIMITER_SHIFT)
+                return _to_utf16(text, tokens), next_state | directive
+            pos = close + len(delimiter) + 2
+            append((start, pos - start, TOKEN_STRING))
+
+    if directive and _continues(text):
+        return _to_utf16(text, tokens), STATE_DIRECTIVE
+    return _to_utf16(text, tokens), STATE_NORMAL
+
+
+# ---------- Syntax Themes ----------
+# Foreground colour, bold and italic for every token kind
+SYNTAX_THEMES = {
+    "Dark+": {
+        TOKEN_KEYWORD: ("#569CD6", True, False),
+        TOKEN_PREPROCESSOR: ("#9B9B9B", False, False),
+        TOKEN_STRING: ("#CE9178", False, False),
+        TOKEN_NUMBER: ("#B5CEA8", False, False),
+        TOKEN_COMMENT: ("#6A9955", False, True),
+        TOKEN_FUNCTION: ("#DCDCAA", False, False),
+    },
+    "Monokai": {
+        TOKEN_KEYWORD: ("#F92672", True, False),
+        TOKEN_PREPROCESSOR: ("#66D9EF", False, False),
+        TOKEN_STRING: ("#E6DB74", False, False),
+        TOKEN_NUMBER: ("#AE81FF", False, False),
+        TOKEN_COMMENT: ("#75715E", False, True),
+        TOKEN_FUNCTION: ("#A6E22E", False, False),
+    },
+}
+
+
+class HighlightTheme(QObject):
+    changed = Signal()
+    _shared = None
+
+    def __init__(self, name="Dark+"):
+        super().__init__()
+        self.name = ""
+        self.formats = {}
+        self.set_scheme(name)
+
+    @classmethod
+    def shared(cls):
+        # One set of formats per process, used by every highlighter
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def set_scheme(self, name):
+        if name not in SYNTAX_THEMES or name == self.name:
+            return
+        formats = {}
+        for kind, (color, bold, italic) in SYNTAX_THEMES[name].items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            if bold:
+                fmt.setFontWeight(QFont.Bold)
+            fmt.setFontItalic(italic)
+            formats[kind] = fmt
+        self.name = name
+        self.formats = formats
+        self.changed.emit()
+
+
+# ---------- Background Tokenizer ----------
+class TokenizerThread(QThread):
+    tokenized = Signal(int, int, int, object, object)  # revision, first, stop, ranges, states
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.text = ""
+        self.revision = 0
+        self.first = 0
+        self.last = 0
+        self.base_ranges = []
+        self.base_states = []
+
+    def run(self):
+        lines = self.text.split("\n")
+        base_ranges = self.base_ranges
+        base_states = self.base_states
+        delta = len(lines) - len(base_states)
+        first = min(self.first, len(lines) - 1)
+        state = base_states[first - 1] if first > 0 else STATE_NORMAL
+
+        # Re-lex from the first changed line until a line past the last
+        # change ends in the same state as it did in the base results
+        ranges = []
+        states = []
+        stop = len(lines)
+        for number in range(first, len(lines)):
+            if not number & 0xFF and self.isInterruptionRequested():
+                return
+            tokens, state = tokenize_cpp(lines[number], state)
+            ranges.append(array("i", chain.from_iterable(tokens)) if tokens else None)
+            states.append(state)
+            if number >= self.last and 0 <= number - delta < len(base_states) \
+                    and base_states[number - delta] == state:
+                stop = number + 1
+                break
+
+        ranges = base_ranges[:first] + ranges + base_ranges[stop - delta:]
+        states = base_states[:first] + states + base_states[stop - delta:]
+        self.tokenized.emit(self.revision, first, stop, ranges, states)
 
 
 # ---------- Enhanced Syntax Highlighter ----------
+# Documents larger than this are highlighted viewport first, in time slices
+PROGRESSIVE_HIGHLIGHT_SIZE = 256 * 1024
+HIGHLIGHT_SLICE_SECONDS = 0.008
+HIGHLIGHT_SLICE_BLOCKS = 32
+
+
 class CppHighlighter(QSyntaxHighlighter):
     def __init__(self, parent):
         super().__init__(parent)
-        self.highlightingRules = []
-
-        # Keywords
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor("#569CD6"))
-        keyword_format.setFontWeight(QFont.Bold)
-        keywords = [
-            "alignas", "alignof", "and", "and_eq", "asm", "auto", "bitand", "bitor",
-            "bool", "break", "case", "catch", "char", "char8_t", "char16_t", "char32_t",
-            "class", "compl", "concept", "const", "consteval", "constexpr", "constinit",
-            "const_cast", "continue", "co_await", "co_return", "co_yield", "decltype",
-            "default", "delete", "do", "double", "dynamic_cast", "else", "enum",
-            "explicit", "export", "extern", "false", "float", "for", "friend", "goto",
-            "if", "inline", "int", "long", "mutable", "namespace", "new", "noexcept",
-            "not", "not_eq", "nullptr", "operator", "or", "or_eq", "private", "protected",
-            "public", "register", "reinterpret_cast", "requires", "return", "short",
-            "signed", "sizeof", "static", "static_assert", "static_cast", "struct",
-            "switch", "template", "this", "thread_local", "throw", "true", "try",
-            "typedef", "typeid", "typename", "union", "unsigned", "using", "virtual",
-            "void", "volatile", "wchar_t", "while", "xor", "xor_eq"
-        ]
-        
-        for word in keywords:
-            pattern = QRegularExpression(f"\\b{word}\\b")
-            self.highlightingRules.append((pattern, keyword_format))
-
-        # Preprocessor directives
-        preprocessor_format = QTextCharFormat()
-        preprocessor_format.setForeground(QColor("#9B9B9B"))
-        self.highlightingRules.append((QRegularExpression(r"#\w+"), preprocessor_format))
-
-        # String literals
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor("#CE9178"))
-        self.highlightingRules.append((QRegularExpression(r"\"([^\"\\]|\\.)*\""), string_format))
-        self.highlightingRules.append((QRegularExpression(r"'([^'\\]|\\.)*'"), string_format))
-
-        # Numbers
-        number_format = QTextCharFormat()
-        number_format.setForeground(QColor("#B5CEA8"))
-        self.highlightingRules.append((QRegularExpression(r"\b\d+\.?\d*[fFlL]?\b"), number_format))
-        self.highlightingRules.append((QRegularExpression(r"\b0[xX][0-9A-Fa-f]+\b"), number_format))
-
-        # Comments
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor("#6A9955"))
-        comment_format.setFontItalic(True)
-        self.highlightingRules.append((QRegularExpression(r"//[^\n]*"), comment_format))
-        
-        # Multi-line comments
-        self.multiline_comment_format = QTextCharFormat()
-        self.multiline_comment_format.setForeground(QColor("#6A9955"))
-        self.multiline_comment_format.setFontItalic(True)
-        
-        # Function names
-        function_format = QTextCharFormat()
-        function_format.setForeground(QColor("#DCDCAA"))
-        self.highlightingRules.append((QRegularExpression(r"\b[A-Za-z_][A-Za-z0-9_]*(?=\s*\()"), function_format))
+        self.theme = HighlightTheme.shared()
+        self.theme.changed.connect(self.restyle)
+
+        # Number of blocks lexed so far; shows how far an edit re-highlights
+        self.blocks_highlighted = 0
+
+        # Progressive mode: blocks before _ready and inside the viewport window
+        # are highlighted, untouched blocks elsewhere wait for the slice timer
+        self.editor = None
+        self._ready = None
+        self._window = (0, 0)
+        self._slice_timer = None
+
+        # Background mode: a worker lexes snapshots and the GUI thread only
+        # applies format ranges. _dirty and _delta describe the edits made
+        # since the base results, in current block numbers.
+        self._tokenizer = None
+
+    def highlight_progressively(self, editor):
+        # Call before loading text: the load itself then skips every block
+        self.editor = editor
+        self._ready = QTextCursor(self.document())
+        self._ready.setKeepPositionOnInsert(True)
+        self._window = (0, 0)
+        if self._slice_timer is None:
+            self._slice_timer = QTimer(self)
+            self._slice_timer.setInterval(0)
+            self._slice_timer.timeout.connect(self._highlight_slice)
+        self._slice_timer.start()
+
+    def restyle(self):
+        if self._tokenizer is not None:
+            self._schedule_apply(0, self.document().blockCount())
+            return
+        # Large documents pick up new formats through the progressive pass
+        document = self.document()
+        if self.editor is None or document.characterCount() <= PROGRESSIVE_HIGHLIGHT_SIZE:
+            self.rehighlight()
+            return
+        block = document.begin()
+        while block.isValid():
+            block.setUserState(-1)
+            block = block.next()
+        self.highlight_progressively(self.editor)
+
+    def is_highlighting(self):
+        return self._ready is not None
+
+    def resume(self):
+        # Progressive passes pause while the editor is hidden
+        if self._ready is not None:
+            self._slice_timer.start()
+
+    def _deferred(self):
+        if self.currentBlockState() != -1:
+            return False
+        position = self.currentBlock().position()
+        if position < self._ready.position():
+            return False
+        start, end = self._window
+        return not start <= position < end
+
+    def _highlight_blocks(self, block, end):
+        # rehighlightBlock carries on while block states change, so only the
+        # blocks that were never lexed need an explicit call
+        while block.isValid() and block.position() < end:
+            if block.userState() == -1:
+                self._rehighlight_from(block)
+            block = block.next()
 
-    def highlightBlock(self, text):
-        # Apply regular highlighting rules
-        for pattern, fmt in self.highlightingRules:
-            match_iterator = pattern.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                start = match.capturedStart()
-                length = match.capturedLength()
-                self.setFormat(start, length, fmt)
-
-        # Handle multi-line comments
-        self.setCurrentBlockState(0)
-        comment_start = QRegularExpression(r"/\*")
-        comment_end = QRegularExpression(r"\*/")
-        
-        if self.previousBlockState() != 1:
-            start_index = comment_start.match(text).capturedStart()
+    def _rehighlight_from(self, block):
+        self.rehighlightBlock(block)
+
+    def _visible_blocks(self):
+        first = self.editor.firstVisibleBlock()
+        line_height = max(1, self.editor.fontMetrics().height())
+        visible = self.editor.viewport().height() // line_height + 2
+        last = first
+        for _ in range(visible):
+            if not last.next().isValid():
+                break
+            last = last.next()
+        return first, last
+
+    def _highlight_viewport(self):
+        first, last = self._visible_blocks()
+        self._window = (first.position(), last.position() + last.length())
+        self._highlight_blocks(first, self._window[1])
+
+    def _highlight_slice(self):
+        if not self.editor.isVisible():
+            self._slice_timer.stop()
+            return
+        deadline = time.perf_counter() + HIGHLIGHT_SLICE_SECONDS
+        self._highlight_viewport()
+
+        document = self.document()
+        block = document.findBlock(self._ready.position())
+        while block.isValid() and time.perf_counter() < deadline:
+            start = block
+            for _ in range(HIGHLIGHT_SLICE_BLOCKS):
+                block = block.next()
+                if not block.isValid():
+                    break
+            end = block.position() if block.isValid() else document.characterCount()
+            self._ready.setPosition(min(end, document.characterCount() - 1))
+            self._highlight_blocks(start, end)
+
+        if not block.isValid():
+            self._slice_timer.stop()
+            self._ready = None
+            self._window = (0, 0)
+
+    def lex_in_background(self, editor):
+        # Call before loading text, like highlight_progressively
+        self.editor = editor
+        document = self.document()
+        self._revision = 0
+        self._base_ranges = []
+        self._base_states = []
+        self._block_count = document.blockCount()
+        self._dirty = (0, self._block_count - 1)
+        self._delta = self._block_count
+        self._apply = None
+        self._applying = None
+        self._generation = 0
+        self._dispatch_pending = False
+
+        self._tokenizer = TokenizerThread()
+        self._tokenizer.tokenized.connect(self._on_tokenized)
+        self._tokenizer.finished.connect(self._on_tokenizer_finished)
+        self._dispatch_timer = QTimer(self)
+        self._dispatch_timer.setSingleShot(True)
+        self._dispatch_timer.setInterval(30)
+        self._dispatch_timer.timeout.connect(self._dispatch)
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setInterval(0)
+        self._apply_timer.timeout.connect(self._apply_slice)
+
+        document.contentsChange.connect(self._on_contents_change)
+        self._dispatch_timer.start()
+
+    def stop_background_lexing(self):
+        if self._tokenizer is not None:
+            self._tokenizer.requestInterruption()
+            self._tokenizer.wait()
+
+    def _on_contents_change(self, position, removed, added):
+        self._revision += 1
+        document = self.document()
+        count = document.blockCount()
+        delta = count - self._block_count
+        self._block_count = count
+        self._delta += delta
+
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(position + added).blockNumber()
+        if self._apply is not None:
+            if self._apply[0] > first:
+                self._apply[0] = max(first, self._apply[0] + delta)
+            if self._apply[1] > first:
+                self._apply[1] += delta
+        if self._dirty is not None:
+            dirty_first, dirty_last = self._dirty
+            if dirty_last >= first:
+                dirty_last += delta
+            first = min(first, dirty_first)
+            last = max(last, dirty_last)
+        self._dirty = (first, last)
+        self._dispatch_timer.start()
+
+    def _dispatch(self):
+        if self._dirty is None:
+            return
+        if self._tokenizer.isRunning():
+            # A newer snapshot supersedes the one being lexed
+            self._tokenizer.requestInterruption()
+            self._dispatch_pending = True
+            return
+        tokenizer = self._tokenizer
+        tokenizer.text = self.document().toPlainText()
+        tokenizer.revision = self._revision
+        tokenizer.first, tokenizer.last = self._dirty
+        tokenizer.base_ranges = self._base_ranges
+        tokenizer.base_states = self._base_states
+        tokenizer.start()
+
+    def _on_tokenizer_finished(self):
+        if self._dispatch_pending:
+            self._dispatch_pending = False
+            self._dispatch()
+
+    def _on_tokenized(self, revision, first, stop, ranges, states):
+        if revision != self._revision:
+            return  # stale: the document changed while this snapshot was lexed
+        self._base_ranges = ranges
+        self._base_states = states
+        self._dirty = None
+        self._delta = 0
+        self._schedule_apply(first, stop)
+
+    def _schedule_apply(self, first, stop):
+        if self._apply is not None:
+            first = min(first, self._apply[0])
+            stop = max(stop, self._apply[1])
+        self._apply = [first, stop]
+
+        # The visible part goes first, the rest follows in time slices
+        visible_first, visible_last = self._visible_blocks()
+        self._apply_blocks(max(first, visible_first.blockNumber()),
+                           min(stop, visible_last.blockNumber() + 1))
+        self._apply_timer.start()
+
+    def _apply_blocks(self, first, stop):
+        # Blocks inside [first, stop) take a fresh generation as their state,
+        # so a single rehighlightBlock call cascades exactly over the range
+        block = self.document().findBlockByNumber(first)
+        if not block.isValid() or first >= stop:
+            return
+        self._generation += 1
+        self._applying = (first, stop)
+        self._rehighlight_from(block)
+        self._applying = None
+
+    def _apply_slice(self):
+        deadline = time.perf_counter() + HIGHLIGHT_SLICE_SECONDS
+        number, stop = self._apply
+        count = self.document().blockCount()
+        while number < min(stop, count) and time.perf_counter() < deadline:
+            chunk = min(number + HIGHLIGHT_SLICE_BLOCKS * 2, stop)
+            self._apply_blocks(number, chunk)
+            number = chunk
+        if number >= min(stop, count):
+            self._apply_timer.stop()
+            self._apply = None
         else:
-            start_index = 0
-            
-        while start_index >= 0:
-            match = comment_end.match(text, start_index)
-            end_index = match.capturedStart()
-            
-            if end_index == -1:
-                self.setCurrentBlockState(1)
-                comment_length = len(text) - start_index
-            else:
-                comment_length = end_index - start_index + match.capturedLength()
-                
-            self.setFormat(start_index, comment_length, self.multiline_comment_format)
-            start_index = comment_start.match(text, start_index + comment_length).capturedStart()
+            self._apply[0] = number
+
+    def _apply_ranges(self, text):
+        # Block states only change inside an apply range; edits re-use the
+        # last results and never cascade into the following blocks
+        number = self.currentBlock().blockNumber()
+        if self._applying is not None and self._applying[0] <= number < self._applying[1]:
+            self.setCurrentBlockState(self._generation)
+        else:
+            self.setCurrentBlockState(self.currentBlockState())
+        if self._dirty is not None and number > self._dirty[1]:
+            number -= self._delta
+        if not 0 <= number < len(self._base_ranges):
+            return
+        ranges = self._base_ranges[number]
+        if ranges is None:
+            return
+        formats = self.theme.formats
+        length = len(text)
+        for i in range(0, len(ranges), 3):
+            start = ranges[i]
+            if start < length:
+                self.setFormat(start, ranges[i + 1], formats[ranges[i + 2]])
+
+    def highlightBlock(self, text):
+        if self._tokenizer is not None:
+            self._apply_ranges(text)
+            return
+        if self._ready is not None and self._deferred():
+            return
+        # The whole lexer state lives in the block state, so Qt stops
+        # re-highlighting as soon as a line ends in the same state as before
+        self.blocks_highlighted += 1
+        state = self.previousBlockState()
+        tokens, state = tokenize_cpp(text, state if state > 0 else STATE_NORMAL)
+        formats = self.theme.formats
+        for start, length, kind in tokens:
+            self.setFormat(start, length, formats[kind])
+        self.setCurrentBlockState(state)
 
 
 # ---------- Enhanced Main Window ----------
 class CppEditorWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        started = time.perf_counter()
         self.setWindowTitle("C++ Editor")
         self.setGeometry(100, 100, 1200, 800)
         icon_path = os.path.join(os.path.dirname(__file__), "logo.ico")
         self.setWindowIcon(QIcon(icon_path))
         self.settings = QSettings("CppEditor", "Settings")
         self.load_settings()
-
+        HighlightTheme.shared().set_scheme(self.settings.value("syntax_theme", "Dark+"))
+
+        self.loading = {}
+        self.batches = {}
+        # Editors in activation order, most recent last, for hibernation
+        self.tab_history = []
+        self.hibernate_timer = QTimer(self)
+        self.hibernate_timer.setSingleShot(True)
+        self.hibernate_timer.timeout.connect(self.enforce_tab_budget)
+        # Unsaved edits are journaled per file path, so they survive
+        # hibernation and can be replayed after a crash
+        self.journals = {}
+        self.recovering = {}
+        self.replaying = False
+        self.autosave = AutoSaveScheduler(
+            lambda editor: self.journals.get(self.tab_widget.tabToolTip(self.tab_widget.indexOf(editor))), self)
+        self.autosave.failed.connect(lambda file_path, error: self.log(f"❌ Auto-save failed: {error}"))
+        self.save_queue = SaveQueue(self)
+        # Save future -> clean state of the snapshot it writes
+        self.save_states = {}
+        # Open files are watched; disk_states holds the size and mtime the
+        # editor last agreed with, so our own saves are not reloaded
+        self.disk_states = {}
+        self.changed_files = set()
+        self.reloads = {}  # editor -> ReloadDiffer in flight
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.on_file_changed)
+        self.file_change_timer = QTimer(self)
+        self.file_change_timer.setSingleShot(True)
+        self.file_change_timer.setInterval(FILE_CHANGE_DELAY)
+        self.file_change_timer.timeout.connect(self.check_changed_files)
+        # Live search follows the find box while the Find & Replace dialog is open
+        self.live_search_editor = None
+        self.live_search_timer = QTimer(self)
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(LIVE_SEARCH_DELAY)
+        self.live_search_timer.timeout.connect(self.update_live_search)
         self.init_ui()
+        self.init_statusbar()
         # Restore working directory
         last_dir = self.settings.value("last_working_directory")
         if last_dir and os.path.isdir(last_dir):
             QDir.setCurrent(last_dir)
             self.set_working_directory(last_dir)  # if you have a function to handle file tree
 
-        # Restore open files
-        open_files = self.settings.value("open_files", [])
-        if open_files:
-            self.tab_widget.clear()  # remove the default blank tab
-            for file in open_files:
-                if os.path.isfile(file):
-                    self.create_new_tab(file)
+        # Restore open files as placeholders, loaded when first activated
+        restored = self.restore_session()
+        self.recover_journals()
 
         self.init_menus()
         self.init_toolbar()
-        self.init_statusbar()
         self.init_shortcuts()
 
         self.current_file = ""
+        elapsed = (time.perf_counter() - started) * 1000
+        self.log(f"🚀 Started in {elapsed:.0f} ms ({restored} tab(s) restored)")
         self.recent_files = self.settings.value("recent_files", [])
         self.update_recent_files_menu()
 
-        self.compilation_thread = None
+        self.build_jobs = BuildJobs(self)
+        self.build_jobs.job_cancelled.connect(
+            lambda output_path: self.log(f"⏹️ Cancelled the running build of {os.path.basename(output_path)}"))
+        self.build_cache = BuildCache(build_cache_dir(), int(self.settings.value("build_cache_mb", 1024)) * 1024 * 1024)
+        self.precompiled_headers = PrecompiledHeaders(precompiled_header_dir())
         self.find_replace_dialog = None
 
     def init_ui(self):
@@ -547,6 +3698,15 @@ class CppEditorWindow(QMainWindow):
 
         self.setCentralWidget(horizontal_splitter)
 
+        # Find in files, searching the working directory
+        self.find_in_files = FindInFilesPanel()
+        self.find_in_files.location_activated.connect(self.open_location)
+        self.find_in_files_dock = QDockWidget("Find in Files", self)
+        self.find_in_files_dock.setObjectName("find_in_files_dock")
+        self.find_in_files_dock.setWidget(self.find_in_files)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.find_in_files_dock)
+        self.find_in_files_dock.hide()
+
     def show_tree_context_menu(self, position):
         index = self.file_tree.indexAt(position)
         if not index.isValid():
@@ -626,6 +3786,7 @@ class CppEditorWindow(QMainWindow):
             self.file_model.setRootPath(path)
             self.file_tree.setRootIndex(self.file_model.index(path))
             self.log(f"📁 Working directory set to: {path}")
+            self.find_in_files.root_changed(path)
 
     
     def open_file_from_tree(self, index):
@@ -640,25 +3801,230 @@ class CppEditorWindow(QMainWindow):
                 self.add_to_recent_files(file_path)
                 self.log(f"📂 Opened from tree: {os.path.basename(file_path)}")
     
-    def create_new_tab(self, file_path=""):
+    def restore_session(self):
+        try:
+            session = json.loads(self.settings.value("session_tabs", "[]"))
+        except ValueError:
+            session = []
+        if not session:
+            # Sessions saved before positions were recorded
+            session = [{"path": path} for path in self.settings.value("open_files", []) or []]
+        session = [tab for tab in session if os.path.isfile(tab["path"])]
+        if not session:
+            return 0
+
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.clear()  # remove the default blank tab
+        for tab in session:
+            placeholder = PlaceholderTab(tab["path"], tab.get("cursor", 0), tab.get("scroll", 0))
+            index = self.tab_widget.addTab(placeholder, os.path.basename(tab["path"]))
+            self.tab_widget.setTabToolTip(index, tab["path"])
+        current = int(self.settings.value("session_current", 0))
+        self.tab_widget.setCurrentIndex(min(max(current, 0), len(session) - 1))
+        self.tab_widget.blockSignals(False)
+        self.on_current_tab_changed(self.tab_widget.currentIndex())
+        return len(session)
+
+    def recover_journals(self):
+        # Journals left behind by a session that did not exit cleanly
+        for name in os.listdir(journal_dir()):
+            if not name.endswith(JOURNAL_SUFFIX):
+                continue
+            journal_path = os.path.join(journal_dir(), name)
+            try:
+                file_path = EditJournal.read(journal_path)[0]
+            except Exception as e:
+                self.log(f"❌ Unreadable edit journal {name}: {str(e)}")
+                continue
+            if not os.path.isfile(file_path):
+                continue
+            self.recovering[file_path] = journal_path
+            for i in range(self.tab_widget.count()):
+                if self.tab_widget.tabToolTip(i) == file_path:
+                    if isinstance(self.tab_widget.widget(i), PlaceholderTab):
+                        self.materialize_tab(self.tab_widget.widget(i), activate=False)
+                    break
+            else:
+                self.open_files([file_path], remember=False)
+
+    def replay_journal(self, editor, journal_path):
+        file_path, base, base_size, edits = EditJournal.read(journal_path)
+        if isinstance(base, tuple):
+            stat = os.stat(file_path)
+            if base != (stat.st_size, stat.st_mtime_ns):
+                os.replace(journal_path, journal_path + ".stale")
+                self.log(f"⚠️ {os.path.basename(file_path)} changed on disk, unsaved edits kept in {journal_path}.stale")
+                return
+
+        # Replay as one undoable step without journaling it again
+        self.replaying = True
+        document = editor.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        if isinstance(base, str):
+            cursor.select(QTextCursor.Document)
+            cursor.insertText(base)
+        for position, removed, text in edits:
+            end = document.characterCount() - 1
+            cursor.setPosition(min(position, end))
+            cursor.setPosition(min(position + removed, end), QTextCursor.KeepAnchor)
+            cursor.insertText(text)
+        cursor.endEditBlock()
+        self.replaying = False
+
+        journal = EditJournal(file_path)
+        journal.resume(base_size)
+        self.journals[file_path] = journal
+        editor.check_modified()
+        self.log(f"♻️ Recovered {len(edits)} unsaved edit(s) in {os.path.basename(file_path)}")
+
+    def journal_edit(self, editor, position, removed, added):
+        # The large file view only swaps the window of lines it shows
+        if self.replaying or editor.loader or isinstance(editor, LargeFileEditor) or not (removed or added):
+            return
+        file_path = self.tab_widget.tabToolTip(self.tab_widget.indexOf(editor))
+        if not file_path:
+            return
+        journal = self.journals.get(file_path)
+        if journal is None:
+            journal = self.journals[file_path] = EditJournal(file_path)
+            try:
+                journal.start()
+            except OSError as e:
+                del self.journals[file_path]
+                self.log(f"❌ Could not start edit journal: {str(e)}")
+                return
+        cursor = QTextCursor(editor.document())
+        cursor.setPosition(position)
+        cursor.setPosition(position + added, QTextCursor.KeepAnchor)
+        journal.record(position, removed, cursor.selectedText().replace("\u2029", "\n"))
+
+    def discard_journal(self, file_path):
+        journal = self.journals.pop(file_path, None)
+        if journal:
+            journal.discard()
+
+    def rebase_journal(self, editor, file_path):
+        # Edits made while a save was in flight no longer apply to the file
+        # on disk, so they are kept as a text snapshot instead
+        self.discard_journal(file_path)
+        journal = EditJournal(file_path)
+        try:
+            journal.start(editor.toPlainText())
+        except OSError as e:
+            self.log(f"❌ Could not start edit journal: {str(e)}")
+            return
+        self.journals[file_path] = journal
+
+    def materialize_tab(self, placeholder, activate=True):
+        # Returns the editor now in the placeholder's place, or None if the file could not be opened
+        index = self.tab_widget.indexOf(placeholder)
+        content = placeholder.text() if placeholder.compressed is not None else None
+        # Rebuilding a hibernated tab is not an edit
+        self.replaying = content is not None
+        editor = self.create_new_tab(placeholder.file_path, activate, index, content)
+        self.replaying = False
+        if editor is None:
+            # The file is gone or unreadable, as create_new_tab logged; its
+            # journal is left alone in case it still holds unsaved edits
+            self.tab_widget.removeTab(self.tab_widget.indexOf(placeholder))
+            placeholder.deleteLater()
+            if self.tab_widget.count() == 0:
+                self.create_new_tab()
+            return None
+        self.tab_widget.removeTab(self.tab_widget.indexOf(placeholder))
+        placeholder.deleteLater()
+        editor.restore_position = (placeholder.cursor_position, placeholder.scroll_value)
+        if content is not None:
+            editor.encoding = placeholder.encoding
+            if placeholder.clean_state:
+                # Still compare against the text on disk, not the restored text
+                editor.clean_state = (-1,) + placeholder.clean_state[1:]
+                editor.check_modified()
+            else:
+                editor.is_modified = True
+            self.restore_editor_position(editor)
+            self.update_encoding_label()
+        return editor
+
+    def hibernate_tab(self, editor):
+        index = self.tab_widget.indexOf(editor)
+        placeholder = PlaceholderTab.hibernate(editor, self.tab_widget.tabToolTip(index))
+        # Write any pending backup while the tab can still be resolved to its path
+        self.autosave.forget(editor, flush=True)
+        self.tab_widget.insertTab(index, placeholder, self.tab_widget.tabText(index))
+        self.tab_widget.setTabToolTip(index, placeholder.file_path)
+        self.tab_widget.removeTab(self.tab_widget.indexOf(editor))
+        self.forget_tab(editor)
+        editor.release()
+        editor.deleteLater()
+
+    def forget_tab(self, editor):
+        if editor in self.tab_history:
+            self.tab_history.remove(editor)
+        self.autosave.forget(editor)
+
+    def enforce_tab_budget(self):
+        # Hibernate least recently used tabs while over the tab or memory budget
+        live_limit = int(self.settings.value("live_tabs", 20))
+        budget = int(self.settings.value("tab_memory_mb", 256)) * 1024 * 1024
+        editors = [self.tab_widget.widget(i) for i in range(self.tab_widget.count())]
+        live = [e for e in editors if isinstance(e, CodeEditor) and not isinstance(e, LargeFileEditor)]
+        used = sum(e.memory_usage() for e in live)
+        current = self.get_current_editor()
+        # Tabs never activated go first, then by how long ago they were used
+        candidates = sorted((e for e in live if e is not current and not e.loader),
+                            key=lambda e: self.tab_history.index(e) if e in self.tab_history else -1)
+        count = len(live)
+        for editor in candidates:
+            if count <= live_limit and used <= budget:
+                break
+            count -= 1
+            used -= editor.memory_usage()
+            self.hibernate_tab(editor)
+        self.update_memory_label()
+
+    def update_memory_label(self):
+        editors = [self.tab_widget.widget(i) for i in range(self.tab_widget.count())]
+        hibernated = sum(1 for e in editors if isinstance(e, PlaceholderTab) and e.compressed is not None)
+        total = sum(e.memory_usage() for e in editors if hasattr(e, "memory_usage"))
+        widget = self.tab_widget.currentWidget()
+        current = widget.memory_usage() if hasattr(widget, "memory_usage") else 0
+        self.memory_label.setText(
+            f"Tab: {format_size(current)} | All: {format_size(total)} ({hibernated} hibernated)")
+
+    def create_new_tab(self, file_path="", activate=True, index=-1, content=None):
         editor = CodeEditor()
-        highlighter = CppHighlighter(editor.document())
         
-        if file_path:
+        large_size = int(self.settings.value("large_file_mb", 64)) * 1024 * 1024
+        if content is None and file_path and os.path.isfile(file_path) and os.path.getsize(file_path) > large_size:
+            # Too big to load: map it and show it through a read-only window
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                editor.setPlainText(content)
-                editor.is_modified = False
-                tab_name = os.path.basename(file_path)
+                editor = LargeFileEditor(file_path)
             except Exception as e:
                 self.log(f"❌ Error opening file: {str(e)}")
                 return None
+            editor.highlighter = CppHighlighter(editor.document())
+            tab_name = os.path.basename(file_path)
+            self.log(f"📖 Opened read-only large file view: {tab_name}")
+        elif file_path and content is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError as e:
+                self.log(f"❌ Error opening file: {str(e)}")
+                return None
+            editor.highlighter = self.create_highlighter(editor, size, file_path, deferred=not activate)
+            self.load_file(editor, file_path)
+            tab_name = os.path.basename(file_path)
         else:
-            tab_name = "Untitled"
+            content = content or ""
+            editor.highlighter = self.create_highlighter(editor, len(content), file_path)
+            editor.setPlainText(content)
+            tab_name = os.path.basename(file_path) if file_path else "Untitled"
         
-        tab_index = self.tab_widget.addTab(editor, tab_name)
-        self.tab_widget.setCurrentIndex(tab_index)
+        tab_index = self.tab_widget.insertTab(index, editor, tab_name)
+        if activate:
+            self.tab_widget.setCurrentIndex(tab_index)
         
         # Store file path in tab
         self.tab_widget.setTabToolTip(tab_index, file_path)
@@ -673,26 +4039,333 @@ class CppEditorWindow(QMainWindow):
         editor.auto_indent_enabled = self.settings.value("auto_indent", True, type=bool)
         wrap = self.settings.value("line_wrap", False, type=bool)
         editor.setLineWrapMode(QPlainTextEdit.WidgetWidth if wrap else QPlainTextEdit.NoWrap)
+        editor.cursorPositionChanged.connect(self.update_cursor_position)
+        self.autosave.watch(editor)
+        editor.document().contentsChange.connect(
+            lambda position, removed, added: self.journal_edit(editor, position, removed, added))
+        editor.modification_changed.connect(lambda modified: self.update_tab_title(editor))
+        editor.matches_counted.connect(lambda count: self.on_matches_counted(editor, count))
+        editor.syntax_check_args = lambda: self.syntax_check_args(editor)
 
         return editor
 
+    def has_tab(self, widget):
+        # Identity check that is safe for editors whose tab was closed
+        return any(self.tab_widget.widget(i) is widget for i in range(self.tab_widget.count()))
+
+    def watch_open_files(self):
+        # Watch every open file except read-only large views; files replaced
+        # by a rename drop out of the watcher and are added back here
+        paths = set()
+        for i in range(self.tab_widget.count()):
+            path = self.tab_widget.tabToolTip(i)
+            if path and not isinstance(self.tab_widget.widget(i), LargeFileEditor) and os.path.isfile(path):
+                paths.add(path)
+        watched = set(self.file_watcher.files())
+        if watched - paths:
+            self.file_watcher.removePaths(list(watched - paths))
+        if paths - watched:
+            self.file_watcher.addPaths(list(paths - watched))
+
+    def on_file_changed(self, file_path):
+        self.changed_files.add(file_path)
+        self.file_change_timer.start()
+
+    def check_changed_files(self):
+        changed, self.changed_files = self.changed_files, set()
+        self.watch_open_files()
+        for i in range(self.tab_widget.count()):
+            file_path = self.tab_widget.tabToolTip(i)
+            if file_path not in changed:
+                continue
+            state = disk_state(file_path)
+            if state == self.disk_states.get(file_path):
+                continue
+            editor = self.tab_widget.widget(i)
+            name = os.path.basename(file_path)
+            if state is None:
+                self.log(f"⚠️ {name} was deleted on disk")
+                self.disk_states[file_path] = None
+                if isinstance(editor, CodeEditor):
+                    editor.is_modified = True
+                continue
+            if isinstance(editor, PlaceholderTab):
+                # Restored tabs read the file when opened; clean hibernated ones can too
+                if not editor.is_modified:
+                    editor.compressed = None
+                    self.disk_states[file_path] = state
+                continue
+            if editor.loader:
+                continue
+            if editor.is_modified:
+                reply = QMessageBox.question(
+                    self, "File Changed",
+                    f"{name} changed on disk. Reload it and discard your changes?",
+                    QMessageBox.Yes | QMessageBox.No
+                )
+                if reply == QMessageBox.No:
+                    self.disk_states[file_path] = state
+                    continue
+            self.reload_file(editor, file_path)
+
+    def reload_file(self, editor, file_path):
+        differ = ReloadDiffer(file_path, editor.toPlainText(), editor.document().revision(), editor.encoding)
+        differ.signals.diffed.connect(
+            lambda path, revision, changes, state: self.apply_reload(editor, path, revision, changes, state))
+        differ.signals.failed.connect(lambda path, error: self.on_reload_failed(editor, path, error))
+        self.reloads[editor] = differ
+        QThreadPool.globalInstance().start(differ)
+
+    def on_reload_failed(self, editor, file_path, error):
+        self.reloads.pop(editor, None)
+        self.log(f"❌ Could not reload {os.path.basename(file_path)}: {error}")
+
+    def apply_reload(self, editor, file_path, revision, changes, state):
+        self.reloads.pop(editor, None)
+        if not self.has_tab(editor):
+            return
+        if editor.document().revision() != revision:
+            # Edited while the diff ran: diff again against the new text
+            self.reload_file(editor, file_path)
+            return
+
+        # Patch only the changed lines as one undoable step; the cursor,
+        # scroll position and highlighting of untouched lines are kept
+        document = editor.document()
+        scroll = editor.verticalScrollBar().value()
+        cursor = QTextCursor(document)
+        self.replaying = True
+        cursor.beginEditBlock()
+        for first, end, lines in changes:
+            count = document.blockCount()
+            if first < end:
+                # Replace or delete lines first..end-1, with their line break
+                start = document.findBlockByNumber(first).position()
+                if end < count:
+                    stop = document.findBlockByNumber(end).position()
+                    text = "".join(line + "\n" for line in lines)
+                elif first > 0:
+                    start -= 1
+                    stop = document.characterCount() - 1
+                    text = "".join("\n" + line for line in lines)
+                else:
+                    stop = document.characterCount() - 1
+                    text = "\n".join(lines)
+                cursor.setPosition(start)
+                cursor.setPosition(stop, QTextCursor.KeepAnchor)
+                cursor.insertText(text)
+            elif first < count:
+                cursor.setPosition(document.findBlockByNumber(first).position())
+                cursor.insertText("".join(line + "\n" for line in lines))
+            else:
+                cursor.setPosition(document.characterCount() - 1)
+                cursor.insertText("".join("\n" + line for line in lines))
+        cursor.endEditBlock()
+        self.replaying = False
+        editor.verticalScrollBar().setValue(scroll)
+
+        editor.is_modified = False
+        self.discard_journal(file_path)
+        self.disk_states[file_path] = state
+        self.log(f"🔄 Reloaded {os.path.basename(file_path)} ({len(changes)} changed region(s))")
+
+    def update_tab_title(self, editor):
+        index = self.tab_widget.indexOf(editor)
+        if index < 0:
+            return
+        file_path = self.tab_widget.tabToolTip(index)
+        tab_name = os.path.basename(file_path) if file_path else "Untitled"
+        self.tab_widget.setTabText(index, f"{tab_name} ●" if editor.was_modified else tab_name)
+
+    def open_files(self, file_paths, source="", remember=True):
+        # Open many files at once: the loaders read them concurrently on the
+        # thread pool while the tabs are added with updates suspended
+        started = time.perf_counter()
+        open_tabs = {self.tab_widget.tabToolTip(i): self.tab_widget.widget(i)
+                     for i in range(self.tab_widget.count())}
+        first = None
+        editors = []
+        self.tab_widget.setUpdatesEnabled(False)
+        try:
+            for file_path in file_paths:
+                if file_path in open_tabs or not os.path.isfile(file_path):
+                    first = first or open_tabs.get(file_path)
+                    continue
+                editor = self.create_new_tab(file_path, activate=False)
+                if editor:
+                    open_tabs[file_path] = editor
+                    editors.append(editor)
+                    first = first or editor
+        finally:
+            self.tab_widget.setUpdatesEnabled(True)
+        if first:
+            self.tab_widget.setCurrentWidget(first)
+
+        if editors and remember:
+            opened = [self.tab_widget.tabToolTip(self.tab_widget.indexOf(e)) for e in editors]
+            self.recent_files = opened[:-11:-1] + [f for f in self.recent_files if f not in opened]
+            self.recent_files = self.recent_files[:10]
+            self.update_recent_files_menu()
+
+        batch = {"started": started, "count": len(editors), "source": source,
+                 "loaders": {e.loader for e in editors if e.loader}}
+        for loader in batch["loaders"]:
+            self.batches[loader] = batch
+        if not batch["loaders"]:
+            self.log_batch_opened(batch)
+        return editors
+
+    def finish_batch_load(self, loader):
+        batch = self.batches.pop(loader, None)
+        if batch:
+            batch["loaders"].discard(loader)
+            if not batch["loaders"]:
+                self.log_batch_opened(batch)
+
+    def log_batch_opened(self, batch):
+        if not batch["count"]:
+            return
+        elapsed = (time.perf_counter() - batch["started"]) * 1000
+        source = f" ({batch['source']})" if batch["source"] else ""
+        self.log(f"📂 Opened {batch['count']} file(s){source} in {elapsed:.0f} ms")
+
+    def load_file(self, editor, file_path):
+        # Read and decode on the thread pool, filling the editor chunk by chunk
+        loader = FileLoader(file_path)
+        editor.loader = loader
+        # Watched from before the first read, so no change during the load goes unseen
+        if file_path not in self.file_watcher.files():
+            self.file_watcher.addPath(file_path)
+        editor.setReadOnly(True)
+        editor.document().setUndoRedoEnabled(False)
+        self.loading[loader] = (0, 1)
+
+        loader.signals.chunk_loaded.connect(
+            lambda text, read, total: self.on_chunk_loaded(editor, loader, text, read, total))
+        loader.signals.restarted.connect(lambda encoding: self.on_load_restarted(editor, loader, encoding))
+        loader.signals.finished.connect(
+            lambda encoding, state: self.on_load_finished(editor, loader, encoding, state))
+        loader.signals.failed.connect(lambda error: self.on_load_failed(editor, loader, error))
+        QThreadPool.globalInstance().start(loader)
+
+    def on_chunk_loaded(self, editor, loader, text, read, total):
+        if loader.cancelled:
+            return
+        cursor = QTextCursor(editor.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.loading[loader] = (read, max(total, 1))
+        self.update_load_progress()
+
+    def on_load_restarted(self, editor, loader, encoding):
+        if loader.cancelled:
+            return
+        editor.clear()
+        self.log(f"🔤 {os.path.basename(loader.file_path)} is not valid UTF-8, reading as {ENCODING_NAMES[encoding]}")
+
+    def on_load_finished(self, editor, loader, encoding, state):
+        self.loading.pop(loader, None)
+        self.update_load_progress()
+        self.finish_batch_load(loader)
+        if loader.cancelled:
+            return
+        editor.loader = None
+        editor.encoding = encoding
+        editor.document().setUndoRedoEnabled(True)
+        editor.setReadOnly(False)
+        editor.is_modified = False
+        self.disk_states[loader.file_path] = state
+        self.watch_open_files()
+        if disk_state(loader.file_path) != state:
+            # Changed while it was read; changes reported meanwhile were skipped
+            self.on_file_changed(loader.file_path)
+        self.restore_editor_position(editor)
+        if loader.file_path in self.recovering:
+            self.replay_journal(editor, self.recovering.pop(loader.file_path))
+        if editor is self.get_current_editor():
+            self.update_encoding_label()
+            editor.schedule_syntax_check()
+        self.hibernate_timer.start()
+
+    def restore_editor_position(self, editor):
+        if editor.restore_position:
+            position, scroll = editor.restore_position
+            editor.restore_position = None
+            cursor = editor.textCursor()
+            cursor.setPosition(min(position, editor.document().characterCount() - 1))
+            editor.setTextCursor(cursor)
+            editor.verticalScrollBar().setValue(scroll)
+        if editor.pending_goto:
+            editor.goto_line(*editor.pending_goto)
+            editor.pending_goto = None
+
+    def on_load_failed(self, editor, loader, error):
+        self.loading.pop(loader, None)
+        self.update_load_progress()
+        self.finish_batch_load(loader)
+        if loader.cancelled:
+            return
+        self.log(f"❌ Error opening file: {error}")
+        index = self.tab_widget.indexOf(editor)
+        if index >= 0:
+            self.close_tab(index)
+
+    def update_load_progress(self):
+        if not self.loading:
+            self.load_progress.hide()
+            return
+        read = sum(read for read, _ in self.loading.values())
+        total = sum(total for _, total in self.loading.values())
+        self.load_progress.setValue(int(read * 100 / total))
+        self.load_progress.show()
+
+    def create_highlighter(self, editor, size, file_path="", deferred=False):
+        # Huge files are left plain, large ones and tabs opened in the
+        # background are coloured viewport first
+        max_size = int(self.settings.value("highlight_max_mb", 32)) * 1024 * 1024
+        if size > max_size:
+            self.log(f"🎨 Highlighting disabled for large file: {os.path.basename(file_path)}")
+            return None
+
+        highlighter = CppHighlighter(editor.document())
+        if self.settings.value("background_lexing", False, type=bool):
+            highlighter.lex_in_background(editor)
+        elif deferred or size > PROGRESSIVE_HIGHLIGHT_SIZE:
+            highlighter.highlight_progressively(editor)
+        return highlighter
+
     def get_current_editor(self):
-        return self.tab_widget.currentWidget()
+        # None while the current tab is a placeholder whose file has not loaded
+        widget = self.tab_widget.currentWidget()
+        return widget if isinstance(widget, CodeEditor) else None
 
     def close_tab(self, index):
         editor = self.tab_widget.widget(index)
-        if editor and editor.is_modified:
+        if editor and editor.is_modified and not editor.loader:
             reply = QMessageBox.question(
                 self, "Unsaved Changes", 
                 "File has unsaved changes. Save before closing?",
                 QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel
             )
             if reply == QMessageBox.Save:
-                self.save_file()
+                # The journal goes once the write succeeds
+                file_path = self.tab_widget.tabToolTip(index)
+                if file_path:
+                    self.save_tab(editor, file_path)
+                else:
+                    self.save_file()
             elif reply == QMessageBox.Cancel:
                 return
-        
+            else:
+                self.discard_journal(self.tab_widget.tabToolTip(index))
+        else:
+            self.discard_journal(self.tab_widget.tabToolTip(index))
         self.tab_widget.removeTab(index)
+        if editor:
+            self.forget_tab(editor)
+            editor.release()
+            editor.deleteLater()
+        self.watch_open_files()
         
         if self.tab_widget.count() == 0:
             self.create_new_tab()
@@ -757,6 +4430,16 @@ class CppEditorWindow(QMainWindow):
         find_action.triggered.connect(self.show_find_replace)
         edit_menu.addAction(find_action)
         
+        find_in_files_action = QAction("Find in Files", self)
+        find_in_files_action.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        find_in_files_action.triggered.connect(self.show_find_in_files)
+        edit_menu.addAction(find_in_files_action)
+        
+        goto_action = QAction("Go to Line", self)
+        goto_action.setShortcut(QKeySequence("Ctrl+G"))
+        goto_action.triggered.connect(self.goto_line)
+        edit_menu.addAction(goto_action)
+        
         edit_menu.addSeparator()
         
         settings_action = QAction("Settings", self)
@@ -776,6 +4459,18 @@ class CppEditorWindow(QMainWindow):
         run_action.triggered.connect(self.compile_and_run)
         build_menu.addAction(run_action)
 
+        build_menu.addSeparator()
+
+        build_project_action = QAction("Build Project", self)
+        build_project_action.setShortcut(QKeySequence("Ctrl+Shift+B"))
+        build_project_action.triggered.connect(lambda: self.build_project())
+        build_menu.addAction(build_project_action)
+
+        run_project_action = QAction("Build & Run Project", self)
+        run_project_action.setShortcut(QKeySequence("Ctrl+Shift+F5"))
+        run_project_action.triggered.connect(lambda: self.build_project(run_after=True))
+        build_menu.addAction(run_project_action)
+
         # Help/About Menu (optional)
         about_action = QAction("About Developer", self)
         about_action.triggered.connect(self.show_about_me)
@@ -852,16 +4547,61 @@ class CppEditorWindow(QMainWindow):
         # File encoding
         self.encoding_label = QLabel("UTF-8")
         self.statusbar.addPermanentWidget(self.encoding_label)
+
+        # Memory held by the current tab and by all tabs
+        self.memory_label = QLabel()
+        self.statusbar.addPermanentWidget(self.memory_label)
+
+        # File loading progress
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(150)
+        self.load_progress.setRange(0, 100)
+        self.load_progress.hide()
+        self.statusbar.addPermanentWidget(self.load_progress)
         
-        # Update line/col on cursor change
-        if self.get_current_editor():
-            self.get_current_editor().cursorPositionChanged.connect(self.update_cursor_position)
+        # Editors connect their own cursor signal; follow tab switches here
+        self.tab_widget.currentChanged.connect(self.on_current_tab_changed)
+
+    def on_current_tab_changed(self, index):
+        if isinstance(self.tab_widget.widget(index), PlaceholderTab):
+            self.materialize_tab(self.tab_widget.widget(index))
+            return
+        editor = self.tab_widget.widget(index)
+        if editor:
+            if editor in self.tab_history:
+                self.tab_history.remove(editor)
+            self.tab_history.append(editor)
+            self.hibernate_timer.start()
+        self.update_cursor_position()
+        self.update_encoding_label()
+        if self.live_search_editor:
+            self.live_search_timer.start()
+        if isinstance(editor, CodeEditor):
+            editor.schedule_syntax_check()
+
+    def syntax_check_args(self, editor):
+        # Only the current tab is checked, with the build's compiler and flags
+        if editor is not self.get_current_editor() or isinstance(editor, LargeFileEditor):
+            return None
+        compiler = self.settings.value("compiler", "g++")
+        if compiler == "cl" or not self.settings.value("syntax_check", True, type=bool):
+            return None
+        file_path = self.tab_widget.tabToolTip(self.tab_widget.indexOf(editor))
+        if file_path and os.path.splitext(file_path)[1].lower() not in SYNTAX_CHECK_SUFFIXES:
+            return None
+        flags = self.settings.value("build_flags", "-std=c++17 -Wall -Wextra")
+        return compiler, flags, os.path.dirname(file_path) if file_path else QDir.currentPath()
+
+    def update_encoding_label(self):
+        editor = self.get_current_editor()
+        if editor:
+            self.encoding_label.setText(ENCODING_NAMES.get(editor.encoding, editor.encoding))
 
     def update_cursor_position(self):
         editor = self.get_current_editor()
         if editor:
             cursor = editor.textCursor()
-            line = cursor.blockNumber() + 1
+            line = cursor.blockNumber() + 1 + editor.first_line_number
             col = cursor.columnNumber() + 1
             self.line_col_label.setText(f"Line: {line}, Col: {col}")
 
@@ -904,6 +4644,20 @@ class CppEditorWindow(QMainWindow):
                 break
         
         self.save_settings()
+
+        self.find_in_files.shutdown()
+        self.build_jobs.shutdown()
+        self.precompiled_headers.cancel()
+
+        # Let queued saves reach the disk before exiting
+        while self.save_queue.busy():
+            QApplication.processEvents(QEventLoop.AllEvents, 50)
+
+        # Exiting on purpose drops the unsaved edits, so their journals go too
+        for file_path in list(self.journals):
+            self.discard_journal(file_path)
+        for i in range(self.tab_widget.count()):
+            self.tab_widget.widget(i).release()
         
         event.accept()
 
@@ -913,86 +4667,130 @@ class CppEditorWindow(QMainWindow):
         self.log_box.appendPlainText(f"{time_str} {message}")
         self.log_box.verticalScrollBar().setValue(self.log_box.verticalScrollBar().maximum())
 
+    def log_output(self, lines):
+        # Compiler output, appended as one block per batch
+        self.log_box.appendPlainText("\n".join(lines))
+        self.log_box.verticalScrollBar().setValue(self.log_box.verticalScrollBar().maximum())
+
     def new_file(self):
         self.create_new_tab()
 
     def open_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self, "Open File", "", 
             "C++ Files (*.cpp *.cxx *.cc *.c *.h *.hpp *.hxx);;All Files (*)"
         )
-        if file_path:
-            # Check if file is already open
-            for i in range(self.tab_widget.count()):
-                if self.tab_widget.tabToolTip(i) == file_path:
-                    self.tab_widget.setCurrentIndex(i)
-                    return
-            
-            editor = self.create_new_tab(file_path)
-            if editor:
-                self.add_to_recent_files(file_path)
-                self.log(f"📂 Opened: {os.path.basename(file_path)}")
+        if file_paths:
+            self.open_files(file_paths)
 
     def save_file(self):
         editor = self.get_current_editor()
-        if not editor:
+        if not editor or isinstance(editor, LargeFileEditor):
             return
         
         current_index = self.tab_widget.currentIndex()
         file_path = self.tab_widget.tabToolTip(current_index)
         
         if not file_path:
-            self.save_file_as()
+            return self.save_file_as()
+        future = self.save_tab(editor, file_path)
+        if future is None:
+            self.log(f"✔️ No changes to save: {os.path.basename(file_path)}")
+        return future
+
+    def save_tab(self, editor, file_path):
+        # The write that leaves the file as the editor shows it, or None if
+        # the file already matches; a write of this very text is reused
+        future = self.save_queue.future(file_path)
+        if future is not None and self.save_states[future][0] == editor.document().revision():
+            return future
+        if future is None and not editor.is_modified:
+            return None
+        return self.queue_save(editor, file_path, f"💾 Saved: {os.path.basename(file_path)}")
+
+    def queue_save(self, editor, file_path, message):
+        # Snapshot now and write on the thread pool; the editor counts as
+        # clean from this snapshot once the write succeeds
+        document = editor.document()
+        text = editor.toPlainText()
+        if not editor.encoding.startswith("utf"):
+            try:
+                text.encode(editor.encoding)
+            except UnicodeEncodeError:
+                # Typed characters the file's encoding cannot hold: every
+                # save would fail, so the file moves to UTF-8 instead
+                name = ENCODING_NAMES.get(editor.encoding, editor.encoding)
+                self.log(f"🔤 {os.path.basename(file_path)} has characters {name} cannot store, saving it as UTF-8")
+                editor.encoding = "utf-8"
+                if editor is self.get_current_editor():
+                    self.update_encoding_label()
+        future = self.save_queue.save(file_path, text, editor.encoding)
+        # Saves merged into one write report it once, for the newest snapshot
+        self.save_states[future] = (document.revision(), document.characterCount(),
+                                    zlib.crc32(text.encode("utf-8", "surrogatepass")))
+        if not future.callbacks:
+            future.add_done_callback(lambda error: self.on_file_saved(editor, file_path, future, error, message))
+        return future
+
+    def on_file_saved(self, editor, file_path, future, error, message):
+        clean_state = self.save_states.pop(future)
+        open_tab = self.has_tab(editor)
+        if error is None:
+            self.disk_states[file_path] = disk_state(file_path)
+            self.watch_open_files()
+            if open_tab:
+                editor.mark_clean(clean_state)
+            if open_tab and editor.is_modified:
+                self.rebase_journal(editor, file_path)
+            else:
+                self.discard_journal(file_path)
+            self.log(message)
             return
-        
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(editor.toPlainText())
-            editor.is_modified = False
-            self.log(f"💾 Saved: {os.path.basename(file_path)}")
-        except Exception as e:
-            QMessageBox.critical(self, "Save Error", f"Could not save file: {str(e)}")
+        # The journal still replays onto the text on disk
+        if not open_tab:
+            journal = self.journals.pop(file_path, None)
+            if journal:
+                journal.close()
+        self.log(f"❌ Could not save {os.path.basename(file_path)}: {error}")
+        QMessageBox.critical(self, "Save Error", f"Could not save file: {error}")
+
+    def when_saved(self, future, callback):
+        # Run callback once the save has reached the disk, or now if nothing was saved
+        if future is None:
+            callback()
+        else:
+            future.add_done_callback(lambda error: error is None and callback())
+
+    def when_all_saved(self, futures, callback):
+        if not futures:
+            callback()
+        else:
+            self.when_saved(futures[0], lambda: self.when_all_saved(futures[1:], callback))
 
     def save_file_as(self):
         editor = self.get_current_editor()
         if not editor:
             return
+        if isinstance(editor, LargeFileEditor):
+            QMessageBox.information(self, "Save As", "Large files are opened read-only.")
+            return
         
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save As", "", 
             "C++ Files (*.cpp *.cxx *.cc *.c *.h *.hpp *.hxx);;All Files (*)"
         )
-        if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(editor.toPlainText())
-                editor.is_modified = False
-                
-                # Update tab
-                current_index = self.tab_widget.currentIndex()
-                self.tab_widget.setTabText(current_index, os.path.basename(file_path))
-                self.tab_widget.setTabToolTip(current_index, file_path)
-                
-                self.add_to_recent_files(file_path)
-                self.log(f"💾 Saved as: {os.path.basename(file_path)}")
-            except Exception as e:
-                QMessageBox.critical(self, "Save Error", f"Could not save file: {str(e)}")
+        if not file_path:
+            return None
 
-    def auto_save_current_file(self):
-        editor = self.get_current_editor()
-        if not editor or not editor.is_modified:
-            return
-        
+        # Update tab
         current_index = self.tab_widget.currentIndex()
-        file_path = self.tab_widget.tabToolTip(current_index)
-        
-        if file_path:
-            try:
-                with open(file_path + ".autosave", 'w', encoding='utf-8') as f:
-                    f.write(editor.toPlainText())
-                self.log("💾 Auto-saved backup")
-            except Exception as e:
-                self.log(f"❌ Auto-save failed: {str(e)}")
+        self.discard_journal(self.tab_widget.tabToolTip(current_index))
+        self.tab_widget.setTabText(current_index, os.path.basename(file_path))
+        self.tab_widget.setTabToolTip(current_index, file_path)
+        self.add_to_recent_files(file_path)
+        self.watch_open_files()
+        editor.schedule_syntax_check()
+        return self.queue_save(editor, file_path, f"💾 Saved as: {os.path.basename(file_path)}")
 
     def add_to_recent_files(self, file_path):
         if file_path in self.recent_files:
@@ -1047,18 +4845,83 @@ class CppEditorWindow(QMainWindow):
         if editor:
             editor.redo()
 
+    def goto_line(self):
+        editor = self.get_current_editor()
+        if not editor:
+            return
+        current = editor.textCursor().blockNumber() + 1 + editor.first_line_number
+        line, ok = QInputDialog.getInt(self, "Go to Line", f"Line (1 - {editor.line_count()}):",
+                                       current, 1, editor.line_count())
+        if ok:
+            editor.goto_line(line)
+
+    def show_find_in_files(self):
+        editor = self.get_current_editor()
+        selected = editor.textCursor().selectedText() if editor else ""
+        self.find_in_files_dock.show()
+        self.find_in_files_dock.raise_()
+        self.find_in_files.focus_query(selected if "\u2029" not in selected else "")
+
+    def open_location(self, file_path, line, column, length):
+        self.open_files([file_path])
+        editor = self.get_current_editor()
+        if not editor or self.tab_widget.tabToolTip(self.tab_widget.currentIndex()) != file_path:
+            return
+        if editor.loader:
+            editor.pending_goto = (line, column, length)
+        else:
+            editor.goto_line(line, column, length)
+        editor.setFocus()
+
     def show_find_replace(self):
         if not self.find_replace_dialog:
             self.find_replace_dialog = FindReplaceDialog(self)
             self.find_replace_dialog.find_button.clicked.connect(self.find_next)
             self.find_replace_dialog.replace_button.clicked.connect(self.replace_current)
             self.find_replace_dialog.replace_all_button.clicked.connect(self.replace_all)
+            # Search as you type, highlighting the matches in view
+            self.find_replace_dialog.find_edit.textChanged.connect(self.live_search_timer.start)
+            for check in (self.find_replace_dialog.case_sensitive_check, self.find_replace_dialog.whole_word_check,
+                          self.find_replace_dialog.regex_check):
+                check.toggled.connect(self.live_search_timer.start)
+            self.find_replace_dialog.finished.connect(lambda result: self.clear_live_search())
         
         self.find_replace_dialog.show()
         self.find_replace_dialog.raise_()
         self.find_replace_dialog.activateWindow()
 
-    def find_next(self):
+    def update_live_search(self):
+        dialog = self.find_replace_dialog
+        editor = self.get_current_editor()
+        if not dialog or not dialog.isVisible() or not isinstance(editor, CodeEditor):
+            return
+        if self.live_search_editor is not editor:
+            self.clear_live_search()
+        try:
+            pattern = dialog.pattern() if dialog.find_edit.toPlainText() else None
+        except re.error as e:
+            pattern = None
+            dialog.status_label.setText(f"Invalid regular expression: {e}")
+        else:
+            dialog.status_label.setText("Counting..." if pattern else "")
+        self.live_search_editor = editor
+        editor.set_live_pattern(pattern)
+        if pattern:
+            # Move to the first match from where the current one starts
+            self.find_next(incremental=True)
+
+    def clear_live_search(self):
+        self.live_search_timer.stop()
+        if self.live_search_editor and self.has_tab(self.live_search_editor):
+            self.live_search_editor.stop_counting()
+            self.live_search_editor.set_live_pattern(None)
+        self.live_search_editor = None
+
+    def on_matches_counted(self, editor, count):
+        if editor is self.live_search_editor and self.find_replace_dialog:
+            self.find_replace_dialog.status_label.setText(f"{count} match(es)" if count else "No matches")
+
+    def find_next(self, incremental=False):
         editor = self.get_current_editor()
         if not editor or not self.find_replace_dialog:
             return
@@ -1066,23 +4929,39 @@ class CppEditorWindow(QMainWindow):
         find_text = self.find_replace_dialog.find_edit.toPlainText()
         if not find_text:
             return
-
-        flags = QTextDocument.FindFlag(0)
-        if self.find_replace_dialog.case_sensitive_check.isChecked():
-            flags |= QTextDocument.FindCaseSensitively
-        if self.find_replace_dialog.whole_word_check.isChecked():
-            flags |= QTextDocument.FindWholeWords
-
-        found = editor.find(find_text, flags)
-        if not found:
-            # Start from beginning
+        status_label = self.find_replace_dialog.status_label
+
+        if isinstance(editor, LargeFileEditor):
+            # Searches the whole mapped file and wraps by itself
+            flags = QTextDocument.FindFlag(0)
+            if self.find_replace_dialog.case_sensitive_check.isChecked():
+                flags |= QTextDocument.FindCaseSensitively
+            if self.find_replace_dialog.whole_word_check.isChecked():
+                flags |= QTextDocument.FindWholeWords
+            found = editor.find(find_text, flags, self.find_replace_dialog.regex_check.isChecked())
+        else:
+            # The same pattern the highlights, count and replace use
+            try:
+                pattern = self.find_replace_dialog.pattern()
+            except re.error as e:
+                status_label.setText(f"Invalid regular expression: {e}")
+                return
+            content = editor.toPlainText()
+            astral = astral_positions(content)
             cursor = editor.textCursor()
-            cursor.movePosition(QTextCursor.Start)
-            editor.setTextCursor(cursor)
-            found = editor.find(find_text, flags)
+            # Incremental search starts again from the current match, so it can grow
+            position = cursor.selectionStart() if incremental else cursor.selectionEnd()
+            match = next_match(pattern, content, from_utf16(astral, position))
+            found = match is not None
+            if found:
+                start, end = match.span()
+                cursor.setPosition(start + bisect_left(astral, start))
+                cursor.setPosition(end + bisect_left(astral, end), QTextCursor.KeepAnchor)
+                editor.setTextCursor(cursor)
 
         if not found:
-            QMessageBox.information(self, "Find", "Text not found.")
+            # Reported in the dialog: a message box would interrupt typing
+            status_label.setText("Text not found")
 
     def replace_current(self):
         editor = self.get_current_editor()
@@ -1090,16 +4969,23 @@ class CppEditorWindow(QMainWindow):
             return
         
         cursor = editor.textCursor()
-        if cursor.hasSelection():
-            find_text = self.find_replace_dialog.find_edit.toPlainText()
-            replace_text = self.find_replace_dialog.replace_edit.toPlainText()
-            
-            selected_text = cursor.selectedText()
-            if (self.find_replace_dialog.case_sensitive_check.isChecked() and 
-                selected_text == find_text) or (
-                not self.find_replace_dialog.case_sensitive_check.isChecked() and 
-                selected_text.lower() == find_text.lower()):
-                cursor.insertText(replace_text)
+        if cursor.hasSelection() and not editor.isReadOnly():
+            try:
+                pattern = self.find_replace_dialog.pattern()
+            except re.error as e:
+                QMessageBox.warning(self, "Replace", f"Invalid regular expression: {e}")
+                return
+            # Match again where the selection starts in the whole text, so
+            # anchors and lookarounds see the same context find_next did
+            content = editor.toPlainText()
+            astral = astral_positions(content)
+            match = pattern.match(content, from_utf16(astral, cursor.selectionStart()))
+            if match and match.end() == from_utf16(astral, cursor.selectionEnd()):
+                try:
+                    cursor.insertText(self.find_replace_dialog.replacement(match))
+                except (re.error, IndexError) as e:
+                    QMessageBox.warning(self, "Replace", f"Invalid replacement: {e}")
+                    return
         
         self.find_next()
 
@@ -1108,27 +4994,43 @@ class CppEditorWindow(QMainWindow):
         if not editor or not self.find_replace_dialog:
             return
         
-        find_text = self.find_replace_dialog.find_edit.toPlainText()
-        replace_text = self.find_replace_dialog.replace_edit.toPlainText()
-        
-        if not find_text:
+        if not self.find_replace_dialog.find_edit.toPlainText():
             return
-        
+        if editor.isReadOnly():
+            QMessageBox.information(self, "Replace All", "This file is open read-only.")
+            return
+        try:
+            pattern = self.find_replace_dialog.pattern()
+        except re.error as e:
+            QMessageBox.warning(self, "Replace All", f"Invalid regular expression: {e}")
+            return
+
+        # One scan finds and counts every match
         content = editor.toPlainText()
-        if self.find_replace_dialog.case_sensitive_check.isChecked():
-            new_content = content.replace(find_text, replace_text)
-        else:
-            # Case-insensitive replace
-            import re
-            pattern = re.escape(find_text)
-            new_content = re.sub(pattern, replace_text, content, flags=re.IGNORECASE)
-        
-        if new_content != content:
-            editor.setPlainText(new_content)
-            count = content.count(find_text) if self.find_replace_dialog.case_sensitive_check.isChecked() else len(re.findall(pattern, content, re.IGNORECASE))
-            QMessageBox.information(self, "Replace All", f"Replaced {count} occurrences")
-        else:
+        matches = list(pattern.finditer(content))
+        if not matches:
             QMessageBox.information(self, "Replace All", "No occurrences found")
+            return
+        try:
+            replacements = [self.find_replace_dialog.replacement(match) for match in matches]
+        except (re.error, IndexError) as e:
+            QMessageBox.warning(self, "Replace All", f"Invalid replacement: {e}")
+            return
+
+        # Qt positions count UTF-16 code units, Python counts code points
+        astral = astral_positions(content)
+
+        # Replace from the end backwards so earlier positions stay valid,
+        # as a single undoable step that only re-highlights touched lines
+        cursor = QTextCursor(editor.document())
+        cursor.beginEditBlock()
+        for match, replacement in zip(reversed(matches), reversed(replacements)):
+            start, end = match.span()
+            cursor.setPosition(start + bisect_left(astral, start))
+            cursor.setPosition(end + bisect_left(astral, end), QTextCursor.KeepAnchor)
+            cursor.insertText(replacement)
+        cursor.endEditBlock()
+        QMessageBox.information(self, "Replace All", f"Replaced {len(matches)} occurrences")
 
     def show_settings(self):
         dialog = SettingsDialog(self)
@@ -1142,10 +5044,19 @@ class CppEditorWindow(QMainWindow):
             dialog.tab_size_spin.setValue(int(self.settings.value("tab_size", 4)))
             dialog.auto_indent_check.setChecked(self.settings.value("auto_indent", True, type=bool))
             dialog.line_wrap_check.setChecked(self.settings.value("line_wrap", False, type=bool))
+            dialog.syntax_theme_combo.setCurrentText(self.settings.value("syntax_theme", "Dark+"))
+            dialog.background_lexing_check.setChecked(self.settings.value("background_lexing", False, type=bool))
+            dialog.highlight_max_spin.setValue(int(self.settings.value("highlight_max_mb", 32)))
+            dialog.large_file_spin.setValue(int(self.settings.value("large_file_mb", 64)))
+            dialog.live_tabs_spin.setValue(int(self.settings.value("live_tabs", 20)))
+            dialog.tab_memory_spin.setValue(int(self.settings.value("tab_memory_mb", 256)))
 
             dialog.compiler_combo.setCurrentText(self.settings.value("compiler", "g++"))
             dialog.flags_edit.setText(self.settings.value("build_flags", "-std=c++17 -Wall -Wextra"))
             dialog.run_in_cmd_check.setChecked(self.settings.value("run_in_cmd", True, type=bool))
+            dialog.build_cache_spin.setValue(int(self.settings.value("build_cache_mb", 1024)))
+            dialog.precompiled_headers_check.setChecked(self.settings.value("precompiled_headers", True, type=bool))
+            dialog.syntax_check_check.setChecked(self.settings.value("syntax_check", True, type=bool))
 
 
         
@@ -1162,14 +5073,24 @@ class CppEditorWindow(QMainWindow):
         self.settings.setValue("tab_size", dialog.tab_size_spin.value())
         self.settings.setValue("auto_indent", dialog.auto_indent_check.isChecked())
         self.settings.setValue("line_wrap", dialog.line_wrap_check.isChecked())
+        self.settings.setValue("syntax_theme", dialog.syntax_theme_combo.currentText())
+        self.settings.setValue("background_lexing", dialog.background_lexing_check.isChecked())
+        self.settings.setValue("highlight_max_mb", dialog.highlight_max_spin.value())
+        self.settings.setValue("large_file_mb", dialog.large_file_spin.value())
+        self.settings.setValue("live_tabs", dialog.live_tabs_spin.value())
+        self.settings.setValue("tab_memory_mb", dialog.tab_memory_spin.value())
         self.settings.setValue("compiler", dialog.compiler_combo.currentText())
         self.settings.setValue("build_flags", dialog.flags_edit.text())
         self.settings.setValue("run_in_cmd", dialog.run_in_cmd_check.isChecked())
+        self.settings.setValue("build_cache_mb", dialog.build_cache_spin.value())
+        self.settings.setValue("precompiled_headers", dialog.precompiled_headers_check.isChecked())
+        self.settings.setValue("syntax_check", dialog.syntax_check_check.isChecked())
+        self.build_cache.max_bytes = dialog.build_cache_spin.value() * 1024 * 1024
 
 
         for i in range(self.tab_widget.count()):
             editor = self.tab_widget.widget(i)
-            if editor:
+            if isinstance(editor, CodeEditor):
                 new_font = QFont(font_family, font_size)
                 editor.setFont(new_font)
                 editor.tab_size = dialog.tab_size_spin.value()
@@ -1178,6 +5099,14 @@ class CppEditorWindow(QMainWindow):
                 wrap = dialog.line_wrap_check.isChecked()
                 editor.setLineWrapMode(QPlainTextEdit.WidgetWidth if wrap else QPlainTextEdit.NoWrap)
 
+        # Recolours every open tab through the shared formats
+        HighlightTheme.shared().set_scheme(dialog.syntax_theme_combo.currentText())
+
+        # The compiler, the flags or the check itself may have changed
+        editor = self.get_current_editor()
+        if isinstance(editor, CodeEditor):
+            editor.schedule_syntax_check()
+
         # Apply to log box
         log_font = QFont(font_family, font_size)
         self.log_box.setFont(log_font)
@@ -1193,11 +5122,24 @@ class CppEditorWindow(QMainWindow):
 
         # ✅ Save open tabs
         open_files = []
+        session = []
         for i in range(self.tab_widget.count()):
             path = self.tab_widget.tabToolTip(i)
             if path:
                 open_files.append(path)
+                editor = self.tab_widget.widget(i)
+                if isinstance(editor, PlaceholderTab):
+                    session.append({"path": path, "cursor": editor.cursor_position,
+                                    "scroll": editor.scroll_value})
+                elif isinstance(editor, LargeFileEditor):
+                    session.append({"path": path})
+                else:
+                    session.append({"path": path, "cursor": editor.textCursor().position(),
+                                    "scroll": editor.verticalScrollBar().value()})
         self.settings.setValue("open_files", open_files)
+        self.settings.setValue("session_tabs", json.dumps(session))
+        current_path = self.get_current_file_path()
+        self.settings.setValue("session_current", open_files.index(current_path) if current_path in open_files else 0)
 
         # ✅ Save current working directory
         self.settings.setValue("last_working_directory", QDir.currentPath())
@@ -1215,9 +5157,10 @@ class CppEditorWindow(QMainWindow):
             QMessageBox.warning(self, "No File", "Please save your file first.")
             return
         
-        # Save current file
-        self.save_file()
-        
+        # Save current file, then compile once it is on disk
+        self.when_saved(self.save_file(), lambda: self.start_compile(file_path))
+
+    def start_compile(self, file_path):
         # Determine output file
         output_path = os.path.splitext(file_path)[0]
         if sys.platform == "win32":
@@ -1228,16 +5171,19 @@ class CppEditorWindow(QMainWindow):
         flags = self.settings.value("build_flags", "-std=c++17 -Wall -Wextra")
         compile_cmd = f'{compiler} "{file_path}" -o "{output_path}" {flags}'
 
-        self.log(f"🔨 Compiling: {os.path.basename(file_path)}")
-        self.log(f"Command: {compile_cmd}")
-        
-        if self.compilation_thread and self.compilation_thread.isRunning():
-            self.compilation_thread.terminate()
-            self.compilation_thread.wait()
-        
-        self.compilation_thread = CompilationThread(compile_cmd)
-        self.compilation_thread.compilation_finished.connect(self.on_compilation_finished)
-        self.compilation_thread.start()
+        headers = self.precompiled_headers if self.settings.value("precompiled_headers", True, type=bool) else None
+
+        def start():
+            self.log(f"🔨 Compiling: {os.path.basename(file_path)}")
+            self.log(f"Command: {compile_cmd}")
+            thread = CompilationThread(compile_cmd, output_path, self.build_cache,
+                                       (compiler, flags, file_path), headers)
+            thread.output_received.connect(self.log_output)
+            thread.compilation_finished.connect(self.on_compilation_finished)
+            thread.start()
+            return thread
+
+        self.build_jobs.submit(output_path, start)
 
     def compile_and_run(self):
         file_path = self.get_current_file_path()
@@ -1245,9 +5191,10 @@ class CppEditorWindow(QMainWindow):
             QMessageBox.warning(self, "No File", "Please save your file first.")
             return
         
-        # Save current file
-        self.save_file()
-        
+        # Save current file, then compile once it is on disk
+        self.when_saved(self.save_file(), lambda: self.start_compile_and_run(file_path))
+
+    def start_compile_and_run(self, file_path):
         # Determine output file
         output_path = os.path.splitext(file_path)[0]
         if sys.platform == "win32":
@@ -1259,61 +5206,92 @@ class CppEditorWindow(QMainWindow):
         compile_cmd = f'{compiler} "{file_path}" -o "{output_path}" {flags}'
 
         run_in_cmd = self.settings.value("run_in_cmd", True, type=bool)
-        
+        headers = self.precompiled_headers if self.settings.value("precompiled_headers", True, type=bool) else None
+
+        def start():
+            self.log(f"🔨 Compiling and running: {os.path.basename(file_path)}")
+            self.log(f"Command: {compile_cmd}")
+            thread = CompilationThread(compile_cmd, output_path, self.build_cache,
+                                       (compiler, flags, file_path), headers)
+            thread.output_received.connect(self.log_output)
+            thread.compilation_finished.connect(
+                lambda rc, errors, seconds: self.on_compilation_finished(rc, errors, seconds,
+                                                                         output_path if run_in_cmd else None)
+            )
+            thread.start()
+            return thread
+
+        self.build_jobs.submit(output_path, start)
+
+    def build_project(self, run_after=False):
+        # Save every modified tab first: any of them may be part of the project
+        root = QDir.currentPath()
+        # Hibernated tabs hold their unsaved text compressed; bring them back to save it
+        for placeholder in [self.tab_widget.widget(i) for i in range(self.tab_widget.count())]:
+            if isinstance(placeholder, PlaceholderTab) and placeholder.is_modified:
+                self.materialize_tab(placeholder, activate=False)
+        futures = []
+        for i in range(self.tab_widget.count()):
+            editor = self.tab_widget.widget(i)
+            file_path = self.tab_widget.tabToolTip(i)
+            if file_path and isinstance(editor, CodeEditor) and not editor.loader:
+                future = self.save_tab(editor, file_path)
+                if future is not None:
+                    futures.append(future)
+        self.when_all_saved(futures, lambda: self.start_project_build(root, run_after))
+
+    def start_project_build(self, root, run_after):
+        compiler = self.settings.value("compiler", "g++")
+        flags = self.settings.value("build_flags", "-std=c++17 -Wall -Wextra")
 
-        self.log(f"🔨 Compiling and running: {os.path.basename(file_path)}")
-        self.log(f"Command: {compile_cmd}")
-        
-        if self.compilation_thread and self.compilation_thread.isRunning():
-            self.compilation_thread.terminate()
-            self.compilation_thread.wait()
-        
-        self.compilation_thread = CompilationThread(compile_cmd, output_path)
-        self.compilation_thread.compilation_finished.connect(
-            lambda rc, stdout, stderr: self.on_compilation_finished(rc, stdout, stderr, run_in_cmd)
-        )
-        self.compilation_thread.start()
+        def start():
+            self.log(f"🏗️ Building project: {root}")
+            build = ProjectBuildThread(root, compiler, flags, self.build_cache)
+            build.output_received.connect(self.log_output)
+            build.compilation_finished.connect(
+                lambda rc, errors, seconds: self.on_compilation_finished(rc, errors, seconds,
+                                                                         build.output_path if run_after else None))
+            build.start()
+            return build
+
+        self.build_jobs.submit(project_output_path(root), start)
 
-    def on_compilation_finished(self, return_code, stdout, stderr, run_after=False):
+    def on_compilation_finished(self, return_code, errors, seconds, run_path=None):
         if return_code == 0:
-            self.log("✅ Compilation successful!")
-            if stdout:
-                self.log(f"Output: {stdout}")
+            self.log(f"✅ Compilation successful! ({seconds:.2f} s)")
             
-            if run_after:
-                file_path = self.get_current_file_path()
-                output_path = os.path.splitext(file_path)[0]
+            if run_path:
                 if sys.platform == "win32":
-                    output_path += ".exe"
                     # Run in new command prompt window
-                    subprocess.Popen(f'start cmd /k "{output_path}"', shell=True)
+                    subprocess.Popen(f'start cmd /k "{run_path}"', shell=True)
                 else:
                     # Run in terminal (Linux/Mac)
-                    subprocess.Popen(['gnome-terminal', '--', output_path])
+                    subprocess.Popen(['gnome-terminal', '--', run_path])
                 
-                self.log(f"🚀 Running: {os.path.basename(output_path)}")
+                self.log(f"🚀 Running: {os.path.basename(run_path)}")
         else:
-            self.log("❌ Compilation failed!")
-            if stderr:
-                self.log(f"Errors:\n{stderr}")
+            # The full output is already in the log; the box only shows its start
+            self.log(f"❌ Compilation failed! ({seconds:.2f} s)")
             QMessageBox.critical(self, "Compilation Error", 
-                               f"Compilation failed with return code {return_code}:\n{stderr}")
+                               f"Compilation failed with return code {return_code}:\n{errors}"
+                               f"\nSee the log for the full output.")
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
 
     def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith(('.cpp', '.cxx', '.cc', '.c', '.h', '.hpp', '.hxx')):
-                self.create_new_tab(file_path)
-                self.add_to_recent_files(file_path)
-                self.log(f"📂 Opened (drag & drop): {os.path.basename(file_path)}")
+        file_paths = [url.toLocalFile() for url in event.mimeData().urls()]
+        file_paths = [f for f in file_paths if f.endswith(('.cpp', '.cxx', '.cc', '.c', '.h', '.hpp', '.hxx'))]
+        if file_paths:
+            self.open_files(file_paths, "drag & drop")
 
 
 # ---------- Application Entry Point ----------
 if __name__ == "__main__":
+    # In the frozen exe, search and index workers start by running this
+    # same executable; freeze_support turns them into workers there
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     
     # Set application properties
@@ -1350,10 +5328,6 @@ if __name__ == "__main__":
     
     # Handle command line arguments
     if len(sys.argv) > 1:
-        for arg in sys.argv[1:]:
-            if os.path.isfile(arg):
-                window.create_new_tab(arg)
-                window.add_to_recent_files(arg)
-                window.log(f"📂 Opened (command line): {os.path.basename(arg)}")
+        window.open_files(sys.argv[1:], "command line")
     
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,43 @@
+# Highlighting speed of the single-pass lexer against the regex highlighter
+# it replaced, on the test sample repeated to a few thousand lines:
+#     python tests/benchmark_lexer.py [copies]
+import sys
+import time
+
+import conftest  # noqa: F401  (offscreen platform, import path)
+from PySide6.QtGui import QTextDocument
+from PySide6.QtWidgets import QApplication
+
+from app import CppHighlighter
+from regex_highlighter import RegexHighlighter
+from test_lexer import SAMPLE
+
+
+def best_of(highlighter_class, text, rounds=3):
+    document = QTextDocument()
+    highlighter = highlighter_class(document)
+    document.setPlainText(text)
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        highlighter.rehighlight()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    text = SAMPLE * copies
+    lines = text.count("\n")
+    regex_seconds = best_of(RegexHighlighter, text)
+    lexer_seconds = best_of(CppHighlighter, text)
+    print(f"{lines} lines, best of 3 full rehighlights")
+    print(f"  regex highlighter: {regex_seconds * 1000:8.1f} ms  ({lines / regex_seconds:,.0f} lines/s)")
+    print(f"  single-pass lexer: {lexer_seconds * 1000:8.1f} ms  ({lines / lexer_seconds:,.0f} lines/s)")
+    print(f"  speedup: {regex_seconds / lexer_seconds:.1f}x")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# The regex highlighter app.py shipped before the single-pass lexer: one
+# QRegularExpression sweep per keyword and rule over every line. Kept as the
+# reference the lexer's formats and speed are compared against.
+from PySide6.QtCore import QRegularExpression
+from PySide6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat
+
+from app import CPP_KEYWORDS
+
+
+class RegexHighlighter(QSyntaxHighlighter):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.highlightingRules = []
+
+        keyword_format = QTextCharFormat()
+        keyword_format.setForeground(QColor("#569CD6"))
+        keyword_format.setFontWeight(QFont.Bold)
+        for word in sorted(CPP_KEYWORDS):
+            self.highlightingRules.append((QRegularExpression(f"\\b{word}\\b"), keyword_format))
+
+        preprocessor_format = QTextCharFormat()
+        preprocessor_format.setForeground(QColor("#9B9B9B"))
+        self.highlightingRules.append((QRegularExpression(r"#\w+"), preprocessor_format))
+
+        string_format = QTextCharFormat()
+        string_format.setForeground(QColor("#CE9178"))
+        self.highlightingRules.append((QRegularExpression(r"\"([^\"\\]|\\.)*\""), string_format))
+        self.highlightingRules.append((QRegularExpression(r"'([^'\\]|\\.)*'"), string_format))
+
+        number_format = QTextCharFormat()
+        number_format.setForeground(QColor("#B5CEA8"))
+        self.highlightingRules.append((QRegularExpression(r"\b\d+\.?\d*[fFlL]?\b"), number_format))
+        self.highlightingRules.append((QRegularExpression(r"\b0[xX][0-9A-Fa-f]+\b"), number_format))
+
+        comment_format = QTextCharFormat()
+        comment_format.setForeground(QColor("#6A9955"))
+        comment_format.setFontItalic(True)
+        self.highlightingRules.append((QRegularExpression(r"//[^\n]*"), comment_format))
+
+        self.multiline_comment_format = QTextCharFormat()
+        self.multiline_comment_format.setForeground(QColor("#6A9955"))
+        self.multiline_comment_format.setFontItalic(True)
+
+        function_format = QTextCharFormat()
+        function_format.setForeground(QColor("#DCDCAA"))
+        self.highlightingRules.append((QRegularExpression(r"\b[A-Za-z_][A-Za-z0-9_]*(?=\s*\()"), function_format))
+
+    def highlightBlock(self, text):
+        for pattern, fmt in self.highlightingRules:
+            match_iterator = pattern.globalMatch(text)
+            while match_iterator.hasNext():
+                match = match_iterator.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+
+        self.setCurrentBlockState(0)
+        comment_start = QRegularExpression(r"/\*")
+        comment_end = QRegularExpression(r"\*/")
+        if self.previousBlockState() != 1:
+            start_index = comment_start.match(text).capturedStart()
+        else:
+            start_index = 0
+        while start_index >= 0:
+            match = comment_end.match(text, start_index)
+            end_index = match.capturedStart()
+            if end_index == -1:
+                self.setCurrentBlockState(1)
+                comment_length = len(text) - start_index
+            else:
+                comment_length = end_index - start_index + match.capturedLength()
+            self.setFormat(start_index, comment_length, self.multiline_comment_format)
+            start_index = comment_start.match(text, start_index + comment_length).capturedStart()
@@ -0,0 +1,59 @@
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QPlainTextEdit
+
+from app import CppHighlighter
+
+SOURCE = "\n".join([
+    "int first = 1;",        # 0
+    "/* a comment",          # 1
+    "   spanning",           # 2
+    "   three lines */",     # 3
+    "int second = 2;",       # 4
+    'const char* s = "a\\',  # 5: string continued with a backslash
+    'b";',                   # 6
+] + [f"int value{i} = {i};" for i in range(7, 40)])
+
+
+def make_editor():
+    editor = QPlainTextEdit()
+    editor.highlighter = CppHighlighter(editor.document())
+    editor.setPlainText(SOURCE)
+    editor.highlighter.rehighlight()
+    return editor
+
+
+def edit(editor, line, column, text="", remove=0):
+    # Blocks lexed by one edit at (line, column)
+    block = editor.document().findBlockByNumber(line)
+    cursor = QTextCursor(block)
+    cursor.setPosition(block.position() + column)
+    cursor.setPosition(block.position() + column + remove, QTextCursor.KeepAnchor)
+    before = editor.highlighter.blocks_highlighted
+    cursor.insertText(text)
+    return editor.highlighter.blocks_highlighted - before
+
+
+def test_normal_line_edit_highlights_one_block(qapp):
+    editor = make_editor()
+    assert edit(editor, 0, 4, "x") == 1
+    assert edit(editor, 20, 0, "// note ") == 1
+
+
+def test_edit_inside_multiline_comment_highlights_one_block(qapp):
+    editor = make_editor()
+    assert edit(editor, 2, 3, "still ") == 1
+    assert edit(editor, 1, 2, "x") == 1
+
+
+def test_edit_inside_continued_string_highlights_one_block(qapp):
+    editor = make_editor()
+    assert edit(editor, 6, 0, "c") == 1
+
+
+def test_state_change_reaches_the_next_unchanged_block(qapp):
+    editor = make_editor()
+    # Closing the comment early changes the state of lines 1 and 2 only;
+    # line 3 still ends outside a comment, so highlighting stops there
+    assert edit(editor, 1, 12, " */") == 3
+    # Opening a comment on a normal line runs to the end of the document
+    assert edit(editor, 30, 0, "/* ") == editor.document().blockCount() - 30
@@ -0,0 +1,83 @@
+from PySide6.QtGui import QFont, QTextDocument
+
+from app import CppHighlighter, HighlightTheme, STATE_NORMAL, TOKEN_COMMENT, TOKEN_STRING, tokenize_cpp
+from regex_highlighter import RegexHighlighter
+
+# Representative code on which the regex highlighter was right: no calls
+# inside strings or // comments, no "//" in strings, no <header> names
+SAMPLE = r'''#include "widget.h"
+#define MAX_ITEMS 64
+
+/* Widget registry.
+   Keeps every widget alive until shutdown. */
+namespace ui {
+
+template <typename T>
+class Registry : public Base {
+public:
+    explicit Registry(int capacity) : capacity_(capacity) {}
+    virtual ~Registry() = default;
+
+    bool add(const T& item) {
+        if (items_.size() >= capacity_) {
+            return false;  // full
+        }
+        items_.push_back(item);
+        return true;
+    }
+
+    double load() const { return items_.size() * 1.5f / capacity_; }
+    unsigned mask() const { return 0xFF00 | flags_; }
+    const char* name() const { return "registry"; }
+    char separator() const { return ','; }
+
+private:
+    std::vector<T> items_;
+    int capacity_ = 0;
+    unsigned flags_ = 0x3;  /* inline */ static constexpr long limit = 100L;
+};
+
+}  // namespace ui
+'''
+
+
+def char_styles(document):
+    # (colour, bold, italic) for every character, None where unformatted
+    styles = []
+    block = document.begin()
+    while block.isValid():
+        line = [None] * block.length()
+        for fmt_range in block.layout().formats():
+            fmt = fmt_range.format
+            style = (fmt.foreground().color().name().lower(), fmt.fontWeight() == QFont.Bold, fmt.fontItalic())
+            for i in range(fmt_range.start, fmt_range.start + fmt_range.length):
+                line[i] = style
+        styles.append(line)
+        block = block.next()
+    return styles
+
+
+def highlight(highlighter_class, text):
+    document = QTextDocument()
+    highlighter = highlighter_class(document)
+    document.setPlainText(text)
+    # Formats applied while the text is set are dropped with the old layout
+    highlighter.rehighlight()
+    return char_styles(document), highlighter
+
+
+def test_matches_regex_highlighter(qapp):
+    HighlightTheme.shared().set_scheme("Dark+")
+    expected, _ = highlight(RegexHighlighter, SAMPLE)
+    actual, _ = highlight(CppHighlighter, SAMPLE)
+    assert sum(style is not None for line in expected for style in line) > 300
+    for number, (want, got) in enumerate(zip(expected, actual), 1):
+        assert got == want, f"line {number}: {SAMPLE.splitlines()[number - 1]!r}"
+
+
+def test_fixes_regex_highlighter_overlaps():
+    # Where the regex rules overlapped, the later rule won
+    assert tokenize_cpp('auto url = "http://example.com";')[0][-1] == (11, 20, TOKEN_STRING)
+    assert tokenize_cpp("// call run(x)")[0] == [(0, 14, TOKEN_COMMENT)]
+    assert tokenize_cpp("#include <vector>")[0][-1] == (9, 8, TOKEN_STRING)
+    assert tokenize_cpp('puts("run(x)");', STATE_NORMAL)[0][1] == (5, 8, TOKEN_STRING)
@@ -0,0 +1,48 @@
+from app import astral_positions, from_utf16, next_match, required_literals, search_pattern
+
+TEXT = "\U0001F600 bar foobar\nbar x \U0001F600bar"
+
+
+def spans(pattern, text):
+    # Every match next_match steps through, starting at the top
+    found, position = [], 0
+    while True:
+        match = next_match(pattern, text, position)
+        if match is None or match.span() in found:
+            return found
+        found.append(match.span())
+        position = match.end()
+
+
+def test_lookarounds_see_the_whole_text():
+    assert spans(search_pattern(r"(?<=foo)bar", regex=True), TEXT) == [(9, 12)]
+
+
+def test_anchors_match_at_line_breaks():
+    pattern = search_pattern(r"^bar|x$", regex=True)
+    assert spans(pattern, TEXT) == [(13, 16)]
+    assert spans(pattern, "a x\nbar") == [(2, 3), (4, 7)]
+
+
+def test_wraps_and_skips_empty_matches():
+    pattern = search_pattern(r"o*", regex=True)
+    assert next_match(pattern, TEXT, 12).span() == (7, 9)
+    assert next_match(search_pattern("zzz"), TEXT, 0) is None
+
+
+def test_whole_word_and_case():
+    assert spans(search_pattern("BAR", whole_word=True), TEXT) == [(2, 5), (13, 16), (20, 23)]
+    assert spans(search_pattern("BAR", case_sensitive=True), TEXT) == []
+
+
+def test_utf16_positions_round_trip():
+    astral = astral_positions(TEXT)
+    assert astral == [0, 19]
+    for position in range(len(TEXT) + 1):
+        assert from_utf16(astral, position + sum(offset < position for offset in astral)) == position
+
+
+def test_index_literals_fold_ascii_only():
+    assert required_literals("Stra\u00dfe") == []
+    assert required_literals("Stra\u00dfe", case_sensitive=True) == ["Stra\u00dfe"]
+    assert required_literals(r"get\w+Value", regex=True) == ["get", "Value"]